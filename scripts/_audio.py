@@ -0,0 +1,57 @@
+"""
+Chargement audio partagé par les scripts de transcription
+
+soundfile (libsndfile) décode directement en float32 normalisé, sans
+sous-processus ffmpeg ni liste Python intermédiaire ; soxr rééchantillonne
+en C (SIMD). pydub/ffmpeg ne sert plus que de secours pour les formats que
+libsndfile ne sait pas lire.
+"""
+
+import numpy as np
+import soundfile as sf
+
+TARGET_SAMPLE_RATE = 16000
+
+
+def _read_with_pydub(audio_path):
+    """Décodage de secours via pydub/ffmpeg -> (samples float32, sample_rate)"""
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(str(audio_path))
+    if audio.sample_width != 2:
+        audio = audio.set_sample_width(2)
+    samples = np.frombuffer(audio.raw_data, dtype=np.int16).astype(np.float32)
+    samples *= 1.0 / 32768.0
+    if audio.channels > 1:
+        samples = samples.reshape(-1, audio.channels)
+    return samples, audio.frame_rate
+
+
+def resample(samples, orig_sr, target_sr=TARGET_SAMPLE_RATE):
+    """Rééchantillonne avec soxr (qualité HQ)"""
+    if orig_sr == target_sr:
+        return samples
+    # Import différé : les fichiers déjà à 16 kHz n'ont pas besoin de soxr
+    import soxr
+    return soxr.resample(samples, orig_sr, target_sr, quality='HQ')
+
+
+def load_audio(audio_path, target_sr=TARGET_SAMPLE_RATE):
+    """
+    Charge un fichier audio en mono float32 contigu à target_sr
+
+    Returns:
+        (samples, sample_rate)
+    """
+    try:
+        samples, sample_rate = sf.read(str(audio_path), dtype='float32', always_2d=False)
+    except sf.LibsndfileError:
+        # Formats non gérés par libsndfile (ex. MP3 avec libsndfile < 1.1)
+        samples, sample_rate = _read_with_pydub(audio_path)
+
+    # Stéréo -> mono (moyenne des canaux, sans repasser par ffmpeg)
+    if samples.ndim == 2:
+        samples = samples.mean(axis=1, dtype=np.float32)
+
+    samples = resample(samples, sample_rate, target_sr)
+    return np.ascontiguousarray(samples, dtype=np.float32), target_sr
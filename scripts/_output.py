@@ -0,0 +1,26 @@
+"""
+Sortie JSON ligne par ligne sur stdout, partagée par les scripts
+
+orjson sérialise directement en bytes (en C) quand il est installé ;
+sinon json de la bibliothèque standard. Une ligne par objet, pour le
+protocole des workers Python de l'app.
+"""
+
+import json
+import sys
+
+try:
+    import orjson
+
+    def dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+
+def write_json(obj, flush=True):
+    """Écrit obj en une ligne JSON sur stdout"""
+    sys.stdout.buffer.write(dumps(obj) + b'\n')
+    if flush:
+        sys.stdout.buffer.flush()
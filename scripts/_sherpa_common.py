@@ -0,0 +1,133 @@
+"""
+Construction du recognizer sherpa-onnx partagée par les scripts de transcription
+
+Un seul endroit pour la configuration Parakeet (feature_dim=128 pour les
+128 bandes mel de Parakeet v3), le nombre de threads et le provider.
+"""
+
+import json
+import os
+import sys
+from importlib import metadata
+
+SAMPLE_RATE = 16000
+FEATURE_DIM = 128
+
+# Fichiers .opt.onnx écrits par optimize_sherpa_models.py :
+# {"onnxruntime": <version>, "provider": "cpu", "files": [<name>.int8.onnx, ...]}
+OPTIMIZED_METADATA_FILE = 'optimized_models.json'
+
+# onnxruntime embarqué par chaque version de sherpa-onnx (cmake/onnxruntime*.cmake
+# du dépôt sherpa-onnx) ; à compléter lors d'une mise à jour de sherpa-onnx.
+# Version absente : les .opt.onnx sont ignorés.
+SHERPA_ONNXRUNTIME_VERSIONS = {
+    '1.12.23': '1.17.1',
+}
+
+
+def default_num_threads():
+    """Moitié des cœurs, plafonnée à 4"""
+    return max(1, min(4, (os.cpu_count() or 2) // 2))
+
+
+def sherpa_ort_version():
+    """Version de l'onnxruntime embarqué par le sherpa-onnx installé, None si inconnue"""
+    try:
+        return SHERPA_ONNXRUNTIME_VERSIONS.get(metadata.version('sherpa-onnx'))
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def read_optimized_metadata(model_dir):
+    """Contenu de optimized_models.json, {} si absent ou illisible"""
+    try:
+        with open(os.path.join(model_dir, OPTIMIZED_METADATA_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_optimized_metadata(model_dir, ort_version, files):
+    """Enregistre la version d'onnxruntime et les fichiers optimisés avec succès"""
+    with open(os.path.join(model_dir, OPTIMIZED_METADATA_FILE), 'w') as f:
+        json.dump({'onnxruntime': ort_version, 'provider': 'cpu', 'files': sorted(files)}, f, indent=2)
+
+
+def optimized_model_usable(model_dir, filename, provider):
+    """
+    Les .opt.onnx contiennent des fusions propres au provider CPU d'une
+    version d'onnxruntime : utilisables seulement en CPU, avec la même version
+    que celle embarquée par sherpa-onnx
+    """
+    if provider != 'cpu':
+        return False
+    recorded = read_optimized_metadata(model_dir)
+    return (
+        recorded.get('provider') == 'cpu'
+        and filename in recorded.get('files', [])
+        and recorded.get('onnxruntime') == sherpa_ort_version()
+    )
+
+
+def model_file(model_dir, name, provider='cpu'):
+    """
+    Chemin d'un fichier modèle, en préférant la version pré-optimisée
+    (<name>.int8.opt.onnx, générée par optimize_sherpa_models.py) si compatible
+    """
+    optimized = os.path.join(model_dir, f'{name}.int8.opt.onnx')
+    if os.path.exists(optimized) and optimized_model_usable(model_dir, f'{name}.int8.onnx', provider):
+        return optimized
+    return os.path.join(model_dir, f'{name}.int8.onnx')
+
+
+def build_recognizer(model_dir, *, num_threads=None, provider='cpu'):
+    """
+    Charge le modèle Parakeet INT8 (encoder/decoder/joiner) via sherpa-onnx
+    provider : 'coreml' (Neural Engine / GPU sur Apple Silicon) ou 'cpu' ;
+    repli sur CPU si le provider demandé est indisponible
+    """
+    import sherpa_onnx
+
+    if num_threads is None:
+        num_threads = default_num_threads()
+
+    try:
+        return sherpa_onnx.OfflineRecognizer.from_transducer(
+            encoder=model_file(model_dir, 'encoder', provider),
+            decoder=model_file(model_dir, 'decoder', provider),
+            joiner=model_file(model_dir, 'joiner', provider),
+            tokens=os.path.join(model_dir, 'tokens.txt'),
+            num_threads=num_threads,
+            sample_rate=SAMPLE_RATE,
+            feature_dim=FEATURE_DIM,
+            model_type='nemo_transducer',
+            provider=provider
+        )
+    except Exception as e:
+        if provider == 'cpu':
+            raise
+        print(f"⚠️  Provider {provider} indisponible, repli sur CPU: {e}", file=sys.stderr)
+        return build_recognizer(model_dir, num_threads=num_threads, provider='cpu')
+
+
+def build_online_recognizer(online_dir, *, num_threads=None, provider='cpu', feature_dim=FEATURE_DIM):
+    """
+    Variante streaming (OnlineRecognizer) : encode par blocs, mémoire bornée
+    quelle que soit la durée de l'audio. Mêmes noms de fichiers que le modèle offline.
+    """
+    import sherpa_onnx
+
+    if num_threads is None:
+        num_threads = default_num_threads()
+
+    return sherpa_onnx.OnlineRecognizer.from_transducer(
+        encoder=model_file(online_dir, 'encoder', provider),
+        decoder=model_file(online_dir, 'decoder', provider),
+        joiner=model_file(online_dir, 'joiner', provider),
+        tokens=os.path.join(online_dir, 'tokens.txt'),
+        num_threads=num_threads,
+        sample_rate=SAMPLE_RATE,
+        feature_dim=feature_dim,
+        decoding_method='greedy_search',
+        provider=provider
+    )
@@ -4,13 +4,172 @@ Convert Whisper or Parakeet models to ONNX format with CoreML optimization
 """
 
 import argparse
+import http.client
 import os
 import json
+import platform
+import sys
+import threading
+import time
+import urllib.error
 import urllib.request
 import zipfile
 import shutil
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Models above this size keep their weights in a co-located <name>.onnx_data
+# file, which ONNX Runtime memory-maps instead of parsing into the protobuf
+EXTERNAL_DATA_THRESHOLD = 1024 * 1024 * 1024
+# Protobuf's hard limit on a serialized ONNX model
+PROTOBUF_LIMIT = 2 * 1024 * 1024 * 1024
+
+# Parallel HTTP range requests used for large archive downloads
+DOWNLOAD_PARTS = 8
+DOWNLOAD_BLOCK_SIZE = 1024 * 1024
+# Attempts per part before giving up; progress is kept across attempts and runs
+DOWNLOAD_RETRIES = 5
+# Seconds between <archive>.meta rewrites (also written when each part ends)
+DOWNLOAD_META_INTERVAL = 2.0
+RETRYABLE_ERRORS = (ConnectionError, TimeoutError, http.client.HTTPException, urllib.error.URLError)
+
+
+def default_intra_op_threads():
+    """
+    Apple Silicon has no SMT: every core counts. Elsewhere, assume 2-way SMT
+    and halve the logical count (same heuristic as inferenceEngine.js)
+    """
+    cpu_count = os.cpu_count() or 2
+    if sys.platform == 'darwin' and platform.machine() == 'arm64':
+        return cpu_count
+    return max(1, cpu_count // 2)
+
+
+def session_hints():
+    """
+    ONNX Runtime session hints stored in config.json for the app
+
+    MLProgram lets CoreML place ops on the Neural Engine as well as GPU/CPU;
+    non-Mac hosts skip the CoreML entry and fall back to the CPU provider.
+    """
+    return {
+        'session_options': {
+            'intra_op_num_threads': default_intra_op_threads(),
+            'graph_optimization_level': 'ORT_ENABLE_ALL'
+        },
+        'providers': [
+            ['CoreMLExecutionProvider', {
+                'ModelFormat': 'MLProgram',
+                'MLComputeUnits': 'ALL',
+                'RequireStaticInputShapes': False
+            }],
+            'CPUExecutionProvider'
+        ]
+    }
+
+
+def move_path(src, dst):
+    """Rename in place (no data copied); copy only across filesystems"""
+    try:
+        os.replace(src, dst)
+    except OSError:
+        shutil.move(src, dst)
+
+
+def externalize_large_models(output_dir, filenames, threshold=EXTERNAL_DATA_THRESHOLD):
+    """
+    Move weights of large ONNX files to external data (<name>.onnx_data)
+
+    Avoids protobuf's 2 GB limit and lets ONNX Runtime page weights in
+    lazily instead of deserializing one huge proto at load time.
+    Returns True when any of the files stores its weights externally.
+    """
+    try:
+        import onnx
+        from onnx.external_data_helper import uses_external_data
+    except ImportError:
+        return False
+
+    any_external = False
+    for filename in filenames:
+        filepath = os.path.join(output_dir, filename)
+        if not os.path.exists(filepath):
+            continue
+
+        graph_only = onnx.load(filepath, load_external_data=False)
+        if any(uses_external_data(t) for t in graph_only.graph.initializer):
+            any_external = True
+            continue
+        if os.stat(filepath).st_size <= threshold:
+            continue
+
+        try:
+            model = onnx.load(filepath)
+            location = filename + '_data'
+            data_path = os.path.join(output_dir, location)
+            # onnx appends to an existing data file: start from an empty one
+            if os.path.exists(data_path):
+                os.remove(data_path)
+            onnx.save_model(
+                model,
+                filepath,
+                save_as_external_data=True,
+                all_tensors_to_one_file=True,
+                location=location,
+                size_threshold=1024,
+                convert_attribute=False
+            )
+            any_external = True
+            print(f"   ✓ {filename}: weights moved to {location}")
+        except Exception as e:
+            print(f"   ⚠️ {filename}: could not externalize weights ({e})")
+
+    return any_external
+
+
+def write_config(output_dir, config):
+    """Write config.json for the inference engine"""
+    config_path = os.path.join(output_dir, 'config.json')
+    with open(config_path, 'w') as f:
+        json.dump(config, f, indent=2)
+
+
+def validate_model_files(output_dir, filenames, strict=True, check_graph=False):
+    """
+    Check that model files exist and report their sizes
+
+    With check_graph, ONNX files are parsed (without external data) to make
+    sure they contain a graph. With strict, a missing or invalid file raises
+    RuntimeError; otherwise it is reported and skipped.
+    """
+    if check_graph:
+        import onnx
+
+    print("🔍 Validating ONNX files...")
+    for filename in filenames:
+        filepath = os.path.join(output_dir, filename)
+        if not os.path.exists(filepath):
+            if strict:
+                raise RuntimeError(f"Missing required ONNX file: {filename}")
+            print(f"   ⚠️ {filename}: NOT FOUND")
+            continue
+
+        file_size_mb = os.stat(filepath).st_size / (1024 * 1024)
+        if not (check_graph and filename.endswith('.onnx')):
+            print(f"   ✓ {filename}: {file_size_mb:.1f} MB")
+            continue
+
+        # Graph structure only: don't pull external weight files into memory
+        model = onnx.load(filepath, load_external_data=False)
+        if not model.graph:
+            if strict:
+                raise RuntimeError(f"Invalid ONNX model (no graph): {filename}")
+            print(f"   ⚠️ {filename}: no graph")
+            continue
+
+        print(f"   ✓ {filename}: {len(model.graph.node)} nodes, {file_size_mb:.1f} MB")
+
 
 def is_parakeet_model(model_id):
     """Check if model is a Parakeet/NeMo model"""
@@ -18,11 +177,397 @@ def is_parakeet_model(model_id):
     return any(p in model_id.lower() for p in parakeet_patterns)
 
 
-def download_parakeet_onnx(model_id, output_dir):
+def print_progress(downloaded, total_size):
+    """Print a download progress line (parsed by the app's auto-converter)"""
+    if total_size > 0:
+        percent = min(100, downloaded * 100 / total_size)
+        mb_downloaded = downloaded / (1024 * 1024)
+        mb_total = total_size / (1024 * 1024)
+        print(f"\r   Progress: {percent:.1f}% ({mb_downloaded:.1f}/{mb_total:.1f} MB)", end='', flush=True)
+
+
+class ProgressReader:
+    """File-like wrapper that reports bytes read as download progress"""
+
+    def __init__(self, fileobj, total_size):
+        self.fileobj = fileobj
+        self.total_size = total_size
+        self.downloaded = 0
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        self.downloaded += len(data)
+        print_progress(self.downloaded, self.total_size)
+        return data
+
+
+class PartialFileReader:
+    """
+    Sequential reader over a file being filled by parallel range downloads
+
+    Blocks until the requested bytes have been written, so the archive can
+    be decompressed while later parts are still downloading.
+    """
+
+    def __init__(self, path, part_size, total_size, filled=None):
+        self.f = open(path, 'rb', buffering=0)
+        self.part_size = part_size
+        self.total_size = total_size
+        self.pos = 0
+        self.filled = {start: 0 for start in range(0, total_size, part_size)}
+        if filled:
+            self.filled.update(filled)
+        self.error = None
+        self.cond = threading.Condition()
+
+    def mark(self, part_start, nbytes):
+        """Record nbytes written contiguously at the end of a part"""
+        with self.cond:
+            self.filled[part_start] += nbytes
+            self.cond.notify_all()
+
+    def fail(self, error):
+        with self.cond:
+            self.error = error
+            self.cond.notify_all()
+
+    def _available(self):
+        part_start = self.pos - self.pos % self.part_size
+        return part_start + self.filled[part_start] - self.pos
+
+    def read(self, size=-1):
+        with self.cond:
+            while self.pos < self.total_size and self.error is None and self._available() == 0:
+                self.cond.wait()
+            if self.error is not None:
+                raise self.error
+            if self.pos >= self.total_size:
+                return b''
+            n = self._available()
+            if size is not None and size >= 0:
+                n = min(n, size)
+
+        # pread bypasses read-ahead buffering, which could cache bytes not yet downloaded
+        data = os.pread(self.f.fileno(), n, self.pos)
+        self.pos += len(data)
+        return data
+
+    def close(self):
+        self.f.close()
+
+
+def load_download_meta(meta_path, validator):
+    """
+    Return per-part progress of an interrupted download, or None
+
+    The sidecar is only trusted when the server still reports the same
+    ETag / Last-Modified / size, so a re-published archive starts over.
+    """
+    try:
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if any(meta.get(key) != value for key, value in validator.items()):
+        return None
+    return {int(start): nbytes for start, nbytes in meta.get('filled', {}).items()}
+
+
+def save_download_meta(meta_path, validator, filled):
+    """Atomically persist per-part progress next to the archive"""
+    tmp_path = meta_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({**validator, 'filled': {str(k): v for k, v in filled.items()}}, f)
+    os.replace(tmp_path, meta_path)
+
+
+def extract_tar_stream(fileobj, output_dir, compression='bz2'):
+    """Extract a .tar.bz2 or .tar.zst stream sequentially (no seeking required)"""
+    if compression == 'zst':
+        import zstandard
+        with zstandard.ZstdDecompressor().stream_reader(fileobj) as stream:
+            with tarfile.open(fileobj=stream, mode='r|') as tar:
+                tar.extractall(output_dir)
+        return
+
+    with tarfile.open(fileobj=fileobj, mode='r|bz2') as tar:
+        tar.extractall(output_dir)
+
+
+def find_zstd_mirror(url):
+    """
+    Return the .tar.zst sibling of a .tar.bz2 URL if it exists, else None
+
+    zstd decompresses roughly 10x faster than single-threaded bzip2; only
+    probed when the zstandard package is installed.
+    """
+    if not url.endswith('.tar.bz2'):
+        return None
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return None
+
+    zst_url = url[:-len('.tar.bz2')] + '.tar.zst'
+    try:
+        with urllib.request.urlopen(urllib.request.Request(zst_url, method='HEAD')) as resp:
+            return zst_url if resp.status == 200 else None
+    except (urllib.error.URLError, OSError):
+        return None
+
+
+def download_and_extract(url, archive_path, output_dir, num_parts=DOWNLOAD_PARTS, compression='bz2'):
+    """
+    Download a .tar.bz2 (or .tar.zst) archive and extract it while it downloads
+
+    With byte-range support, parts are fetched concurrently into a
+    preallocated archive file and decompression follows the first part as
+    it arrives. Otherwise the HTTP response is decompressed as a single
+    stream without writing the archive to disk.
+
+    Range downloads are resumable: dropped connections are retried from the
+    last byte written, and progress is kept in `<archive>.meta` so a later
+    run only fetches what is missing.
+    """
+    head = urllib.request.Request(url, method='HEAD')
+    with urllib.request.urlopen(head) as resp:
+        # Resolve redirects once (GitHub releases redirect to a CDN URL)
+        url = resp.geturl()
+        total_size = int(resp.headers.get('Content-Length') or 0)
+        accepts_ranges = resp.headers.get('Accept-Ranges', '').lower() == 'bytes'
+        etag = resp.headers.get('ETag')
+        last_modified = resp.headers.get('Last-Modified')
+
+    if not accepts_ranges or total_size < num_parts * DOWNLOAD_BLOCK_SIZE:
+        with urllib.request.urlopen(url) as resp:
+            extract_tar_stream(ProgressReader(resp, total_size), output_dir, compression)
+        print()  # New line after progress
+        return
+
+    part_size = -(-total_size // num_parts)
+    meta_path = archive_path + '.meta'
+    validator = {'etag': etag, 'last_modified': last_modified, 'size': total_size, 'part_size': part_size}
+
+    filled = None
+    if (etag or last_modified) and os.path.exists(archive_path) and os.stat(archive_path).st_size == total_size:
+        filled = load_download_meta(meta_path, validator)
+
+    if filled:
+        print(f"   Resuming download ({sum(filled.values()) / (1024 * 1024):.1f} MB already on disk)")
+    else:
+        with open(archive_path, 'wb') as f:
+            f.truncate(total_size)
+
+    reader = PartialFileReader(archive_path, part_size, total_size, filled)
+    downloaded = sum(reader.filled.values())
+    lock = threading.Lock()
+    meta_lock = threading.Lock()
+    meta_saved_at = time.monotonic()
+
+    def persist_progress(force=False):
+        # Periodic, off the progress lock: parts don't queue behind file I/O
+        nonlocal meta_saved_at
+        if not force and time.monotonic() - meta_saved_at < DOWNLOAD_META_INTERVAL:
+            return
+        with meta_lock:
+            save_download_meta(meta_path, validator, reader.filled)
+            meta_saved_at = time.monotonic()
+
+    def fetch_range(fd, start, end):
+        nonlocal downloaded
+        offset = start + reader.filled[start]
+        headers = {'Range': f'bytes={offset}-{end}'}
+        if etag:
+            # Server answers 200 (full body) instead of 206 if the archive changed
+            headers['If-Range'] = etag
+        request = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(request) as resp:
+            if resp.status != 206:
+                raise urllib.error.HTTPError(url, resp.status, 'Range request not honored', resp.headers, None)
+            while True:
+                block = resp.read(DOWNLOAD_BLOCK_SIZE)
+                if not block:
+                    break
+                os.pwrite(fd, block, offset)
+                offset += len(block)
+                reader.mark(start, len(block))
+                with lock:
+                    downloaded += len(block)
+                    print_progress(downloaded, total_size)
+                persist_progress()
+        if offset != end + 1:
+            raise ConnectionError(f"connection closed at byte {offset}")
+
+    def fetch_part(start):
+        end = min(start + part_size, total_size) - 1
+        fd = os.open(archive_path, os.O_WRONLY)
+        try:
+            for attempt in range(1, DOWNLOAD_RETRIES + 1):
+                if start + reader.filled[start] > end:
+                    return
+                try:
+                    fetch_range(fd, start, end)
+                    return
+                except urllib.error.HTTPError:
+                    raise
+                except RETRYABLE_ERRORS as e:
+                    if attempt == DOWNLOAD_RETRIES:
+                        raise
+                    print(f"\n   Download interrupted ({e}), resuming...")
+                    time.sleep(attempt)
+        finally:
+            os.close(fd)
+            persist_progress(force=True)
+
+    def fetch_all():
+        try:
+            with ThreadPoolExecutor(max_workers=num_parts) as pool:
+                list(pool.map(fetch_part, range(0, total_size, part_size)))
+            print()  # New line after progress
+            print("📦 Extracting model files...")
+        except Exception as e:
+            reader.fail(e)
+
+    downloader = threading.Thread(target=fetch_all, daemon=True)
+    downloader.start()
+    range_error = None
+    try:
+        extract_tar_stream(reader, output_dir, compression)
+    except urllib.error.HTTPError as e:
+        range_error = e
+    finally:
+        reader.close()
+        downloader.join()
+
+    os.remove(archive_path)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    if range_error is not None:
+        print(f"\n   Parallel download unavailable ({range_error.code}), using a single stream...")
+        with urllib.request.urlopen(url) as resp:
+            extract_tar_stream(ProgressReader(resp, total_size), output_dir, compression)
+        print()  # New line after progress
+
+
+def external_data_locations(filepath):
+    """Files holding external weights of an ONNX model (relative to its directory)"""
+    import onnx
+    from onnx.external_data_helper import uses_external_data
+
+    model = onnx.load(filepath, load_external_data=False)
+    return {
+        entry.value
+        for tensor in model.graph.initializer if uses_external_data(tensor)
+        for entry in tensor.external_data if entry.key == 'location'
+    }
+
+
+def quantize_transducer_models(output_dir, filenames):
+    """
+    Weight-only INT8 quantization of MatMul/Gemm layers, per output channel
+
+    Conv and LayerNorm stay in FP32: ONNX Runtime has fast int8 MatMul CPU
+    kernels, while quantized Conv often falls back to float compute and ends
+    up slower than FP32. Each file is replaced in place.
+
+    Sources with external data (or above protobuf's 2 GB limit, like the FP32
+    Parakeet encoder) are quantized with external data, then saved back as a
+    single file; the FP32 weight files are removed.
+    Returns True when every file was quantized.
+    """
+    try:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        import onnxruntime
+        import onnx
+    except ImportError:
+        print("   ⚠️ onnxruntime not installed, keeping FP32 models")
+        return False
+
+    all_quantized = True
+    for filename in filenames:
+        filepath = os.path.join(output_dir, filename)
+        quantized_path = filepath.replace('.onnx', '.int8.onnx.tmp')
+        merged_path = filepath + '.new'
+        quantized_data = set()
+        try:
+            source_data = external_data_locations(filepath)
+            sizes = [os.path.getsize(filepath)] + [os.path.getsize(os.path.join(output_dir, loc)) for loc in source_data]
+            use_external = bool(source_data) or sizes[0] >= PROTOBUF_LIMIT
+
+            quantize_dynamic(
+                model_input=filepath,
+                model_output=quantized_path,
+                weight_type=QuantType.QInt8,
+                per_channel=True,
+                reduce_range=False,
+                op_types_to_quantize=['MatMul', 'Gemm'],
+                use_external_data_format=use_external
+            )
+            if use_external:
+                quantized_data = external_data_locations(quantized_path)
+            # Sanity check: the quantized graph must load on the CPU provider
+            onnxruntime.InferenceSession(quantized_path, providers=['CPUExecutionProvider'])
+
+            if use_external:
+                # INT8 weights fit in one protobuf again: no stray .data files
+                model = onnx.load(quantized_path)
+                if model.ByteSize() >= PROTOBUF_LIMIT:
+                    raise ValueError("quantized model still exceeds 2 GB")
+                onnx.save(model, merged_path)
+                os.replace(merged_path, filepath)
+                os.remove(quantized_path)
+                for location in source_data | quantized_data:
+                    os.remove(os.path.join(output_dir, location))
+            else:
+                os.replace(quantized_path, filepath)
+
+            before_mb = sum(sizes) / (1024 * 1024)
+            after_mb = os.path.getsize(filepath) / (1024 * 1024)
+            print(f"   ✓ {filename}: {before_mb:.1f} MB -> {after_mb:.1f} MB")
+        except Exception as e:
+            for path in [quantized_path, merged_path] + [os.path.join(output_dir, loc) for loc in quantized_data]:
+                if os.path.exists(path):
+                    os.remove(path)
+            print(f"   ⚠️ {filename}: quantization failed ({e}), keeping FP32")
+            all_quantized = False
+
+    return all_quantized
+
+
+def specialize_transducer_graphs(output_dir):
+    """
+    Write joiner.argmax.onnx and decoder.step.onnx (see specialize_transducer.py)
+
+    Each graph is kept only if it matches the original on the parity fixture.
+    Optional: the app falls back to joiner.onnx / decoder.onnx when missing.
+    Returns {'joiner_argmax': name|None, 'decoder_step': name|None} for config.json.
+    """
+    specialized = {'joiner_argmax': None, 'decoder_step': None}
+    try:
+        from specialize_transducer import specialization_jobs, write_verified
+        jobs = specialization_jobs(os.path.join(output_dir, 'tokens.txt'))
+    except (ImportError, OSError) as e:
+        print(f"   ⚠️ Graph specialization skipped ({e})")
+        return specialized
+
+    for key, source, target, build, check in jobs:
+        try:
+            write_verified(build, check, os.path.join(output_dir, source), os.path.join(output_dir, target))
+            print(f"   ✓ {target}: specialized from {source}, outputs match")
+            specialized[key] = target
+        except Exception as e:
+            print(f"   ⚠️ {target} not kept ({e}), using {source}")
+    return specialized
+
+
+def download_parakeet_onnx(model_id, output_dir, int8=False):
     """
     Download pre-converted Parakeet ONNX models from sherpa-onnx releases
     
-    Parakeet TDT models are transducers (RNN-T) with encoder + decoder + joiner
+    Parakeet TDT models are transducers (RNN-T) with encoder + decoder + joiner.
+    With int8, FP32 releases are quantized locally (per-channel, MatMul only).
     """
     print(f"🔄 Downloading pre-converted Parakeet model...")
     print(f"📁 Output directory: {output_dir}")
@@ -43,6 +588,7 @@ def download_parakeet_onnx(model_id, output_dir):
             'url': 'https://github.com/k2-fsa/sherpa-onnx/releases/download/asr-models/sherpa-onnx-nemo-parakeet-tdt-0.6b-v3-int8.tar.bz2',
             'type': 'transducer',
             'files': ['encoder.int8.onnx', 'decoder.int8.onnx', 'joiner.int8.onnx', 'tokens.txt'],
+            'quantization': 'int8',
             'rename': {
                 'encoder.int8.onnx': 'encoder.onnx',
                 'decoder.int8.onnx': 'decoder.onnx',
@@ -53,6 +599,7 @@ def download_parakeet_onnx(model_id, output_dir):
             'url': 'https://github.com/k2-fsa/sherpa-onnx/releases/download/asr-models/sherpa-onnx-nemo-parakeet-tdt-0.6b-v2-int8.tar.bz2',
             'type': 'transducer',
             'files': ['encoder.int8.onnx', 'decoder.int8.onnx', 'joiner.int8.onnx', 'tokens.txt'],
+            'quantization': 'int8',
             'rename': {
                 'encoder.int8.onnx': 'encoder.onnx',
                 'decoder.int8.onnx': 'decoder.onnx',
@@ -85,26 +632,15 @@ def download_parakeet_onnx(model_id, output_dir):
     print(f"⬇️  Downloading from: {url}")
     print("   This may take a few minutes...")
     
-    # Download archive
-    archive_path = os.path.join(output_dir, 'model.tar.bz2')
-    
-    def progress_hook(block_num, block_size, total_size):
-        downloaded = block_num * block_size
-        if total_size > 0:
-            percent = min(100, downloaded * 100 / total_size)
-            mb_downloaded = downloaded / (1024 * 1024)
-            mb_total = total_size / (1024 * 1024)
-            print(f"\r   Progress: {percent:.1f}% ({mb_downloaded:.1f}/{mb_total:.1f} MB)", end='', flush=True)
-    
-    urllib.request.urlretrieve(url, archive_path, progress_hook)
-    print()  # New line after progress
-    
-    print("📦 Extracting model files...")
-    
-    # Extract tar.bz2
-    import tarfile
-    with tarfile.open(archive_path, 'r:bz2') as tar:
-        tar.extractall(output_dir)
+    # Download and extract (decompression overlaps the download)
+    zst_url = find_zstd_mirror(url)
+    if zst_url:
+        print("   Using zstd-compressed archive")
+        archive_path = os.path.join(output_dir, 'model.tar.zst')
+        download_and_extract(zst_url, archive_path, output_dir, compression='zst')
+    else:
+        archive_path = os.path.join(output_dir, 'model.tar.bz2')
+        download_and_extract(url, archive_path, output_dir)
     
     # Find extracted directory and move files up
     extracted_dirs = [d for d in os.listdir(output_dir) if os.path.isdir(os.path.join(output_dir, d)) and d != 'test_wavs']
@@ -118,12 +654,9 @@ def download_parakeet_onnx(model_id, output_dir):
                     shutil.rmtree(dst)
                 else:
                     os.remove(dst)
-            shutil.move(src, dst)
+            move_path(src, dst)
         shutil.rmtree(extracted_dir)
     
-    # Clean up archive
-    os.remove(archive_path)
-    
     # Rename files if needed (e.g., encoder.fp16.onnx -> encoder.onnx)
     if 'rename' in model_info:
         print("📝 Renaming model files...")
@@ -131,11 +664,23 @@ def download_parakeet_onnx(model_id, output_dir):
             old_path = os.path.join(output_dir, old_name)
             new_path = os.path.join(output_dir, new_name)
             if os.path.exists(old_path):
-                if os.path.exists(new_path):
-                    os.remove(new_path)
-                shutil.move(old_path, new_path)
+                move_path(old_path, new_path)
                 print(f"   {old_name} -> {new_name}")
     
+    # Pre-quantized releases declare it; the others may be quantized below
+    quantization = model_info.get('quantization')
+    if int8 and quantization is None:
+        print("⚖️  Quantizing MatMul weights to INT8 (per-channel)...")
+        if quantize_transducer_models(output_dir, ['encoder.onnx', 'decoder.onnx', 'joiner.onnx']):
+            quantization = 'int8-per-channel'
+        print("")
+    elif int8:
+        print("   Model is already INT8, skipping local quantization")
+
+    external_data = externalize_large_models(output_dir, ['encoder.onnx', 'decoder.onnx', 'joiner.onnx'])
+
+    specialized = specialize_transducer_graphs(output_dir)
+
     # Create config file for inference engine
     config = {
         'model_type': 'transducer',
@@ -144,31 +689,24 @@ def download_parakeet_onnx(model_id, output_dir):
             'encoder': 'encoder.onnx',
             'decoder': 'decoder.onnx', 
             'joiner': 'joiner.onnx',
+            **specialized,
             'tokens': 'tokens.txt'
         },
         'sample_rate': 16000,
-        'feature_dim': 80,
-        'subsampling_factor': 4
+        'feature_dim': 128,  # Parakeet v3: 128 mel bins
+        'subsampling_factor': 4,
+        'quantization': quantization,
+        'external_data': external_data,
+        **session_hints()
     }
     
-    config_path = os.path.join(output_dir, 'config.json')
-    with open(config_path, 'w') as f:
-        json.dump(config, f, indent=2)
+    write_config(output_dir, config)
     
     print("✅ Download complete!")
     print("")
     
     # Validate files - check for renamed files
-    print("🔍 Validating ONNX files...")
-    expected_files = ['encoder.onnx', 'decoder.onnx', 'joiner.onnx', 'tokens.txt']
-    for filename in expected_files:
-        filepath = os.path.join(output_dir, filename)
-        
-        if os.path.exists(filepath):
-            file_size_mb = os.path.getsize(filepath) / (1024 * 1024)
-            print(f"   ✓ {filename}: {file_size_mb:.1f} MB")
-        else:
-            print(f"   ⚠️ {filename}: NOT FOUND")
+    validate_model_files(output_dir, ['encoder.onnx', 'decoder.onnx', 'joiner.onnx', 'tokens.txt'], strict=False)
     
     print("")
     print("✅ Parakeet model ready!")
@@ -177,13 +715,185 @@ def download_parakeet_onnx(model_id, output_dir):
     return True
 
 
-def convert_whisper_model(model_id, output_dir, optimize=True):
+def simplify_onnx_models(output_dir, filenames):
+    """
+    Simplify exported graphs with onnxsim and run ONNX shape inference
+
+    Optional step: skipped when onnxsim is not installed. A model is only
+    replaced when the simplified graph passes onnxsim's equivalence check.
+    """
+    try:
+        import onnx
+        import onnxsim
+    except ImportError:
+        print("   ⚠️ onnxsim not installed, skipping graph simplification (pip3 install onnxsim)")
+        return
+
+    for filename in filenames:
+        filepath = os.path.join(output_dir, filename)
+        try:
+            model = onnx.load(filepath)
+            simplified, ok = onnxsim.simplify(model)
+            if not ok:
+                print(f"   ⚠️ {filename}: simplified graph failed validation, keeping original")
+                continue
+
+            simplified = onnx.shape_inference.infer_shapes(simplified)
+            onnx.save(simplified, filepath)
+            print(f"   ✓ {filename}: {len(model.graph.node)} -> {len(simplified.graph.node)} nodes")
+        except Exception as e:
+            print(f"   ⚠️ {filename}: simplification failed ({e}), keeping original")
+
+
+def export_static_encoder(output_dir, n_mels, n_frames=3000):
+    """
+    Write encoder_model.static.onnx specialized for Whisper's canonical input
+
+    The app always pads features to [1, n_mels, 3000] (30 s), so fixing the
+    input shape lets onnxsim fold the Reshape/MatMul shape arithmetic and
+    lets CoreML pick fixed-shape kernels. The dynamic encoder is kept.
+    Returns the static filename, or None when it could not be produced.
+    """
+    try:
+        import onnx
+        import onnxsim
+    except ImportError:
+        print("   ⚠️ onnxsim not installed, skipping static encoder")
+        return None
+
+    static_name = 'encoder_model.static.onnx'
+    try:
+        model = onnx.load(os.path.join(output_dir, 'encoder_model.onnx'))
+        static_shape = [1, n_mels, n_frames]
+        for graph_input in model.graph.input:
+            if graph_input.name == 'input_features':
+                for dim, value in zip(graph_input.type.tensor_type.shape.dim, static_shape):
+                    dim.dim_value = value
+
+        model, ok = onnxsim.simplify(model, overwrite_input_shapes={'input_features': static_shape})
+        if not ok:
+            print("   ⚠️ static encoder failed validation, skipping")
+            return None
+
+        onnx.save(model, os.path.join(output_dir, static_name))
+        print(f"   ✓ {static_name}: input_features {static_shape}")
+        return static_name
+    except Exception as e:
+        print(f"   ⚠️ static encoder export failed ({e}), skipping")
+        return None
+
+
+def load_with_app_providers(filepath):
+    """
+    Create an ONNX Runtime session with the app's providers and graph level
+
+    Uses session_hints() (CoreML first when this onnxruntime build has it,
+    then CPU), so fused contrib ops or fp16 kernels that the runtime cannot
+    place fail here instead of in the app. Raises on failure.
+    """
+    import onnxruntime
+
+    hints = session_hints()
+    available = onnxruntime.get_available_providers()
+    providers = [
+        tuple(provider) if isinstance(provider, list) else provider
+        for provider in hints['providers']
+        if (provider[0] if isinstance(provider, list) else provider) in available
+    ]
+
+    sess_options = onnxruntime.SessionOptions()
+    sess_options.graph_optimization_level = getattr(
+        onnxruntime.GraphOptimizationLevel, hints['session_options']['graph_optimization_level']
+    )
+    onnxruntime.InferenceSession(filepath, sess_options, providers=providers)
+
+
+def fuse_transformer_models(output_dir, filenames, model_id, fp16=False):
+    """
+    Run ONNX Runtime's offline transformer optimizer on exported graphs
+
+    Fuses Attention / LayerNorm / SkipLayerNorm / GELU so the runtime does not
+    materialize intermediate QKV tensors. With fp16, weights are converted to
+    float16 while graph inputs/outputs stay float32 for the inference engine.
+
+    Each optimized graph must load with the app's providers before it replaces
+    the original: FP16 falls back to the fused FP32 graph, then to the
+    unfused one. Returns {filename: precision actually written}.
+    """
+    precisions = {filename: 'fp32' for filename in filenames}
+    try:
+        from onnxruntime.transformers.optimizer import optimize_model
+        from transformers import AutoConfig
+    except ImportError:
+        print("   ⚠️ onnxruntime transformers optimizer not available, skipping fusion")
+        return precisions
+
+    model_config = AutoConfig.from_pretrained(model_id)
+    num_heads = getattr(model_config, 'encoder_attention_heads', 0)
+    hidden_size = getattr(model_config, 'd_model', 0)
+
+    for filename in filenames:
+        filepath = os.path.join(output_dir, filename)
+        candidate_path = filepath + '.fused'
+        for precision in (['fp16', 'fp32'] if fp16 else ['fp32']):
+            try:
+                # Whisper shares BART's encoder-decoder attention layout
+                model = optimize_model(
+                    filepath,
+                    model_type='bart',
+                    num_heads=num_heads,
+                    hidden_size=hidden_size,
+                    opt_level=99,
+                    use_gpu=False,
+                    only_onnxruntime=False
+                )
+                if precision == 'fp16':
+                    model.convert_float_to_float16(keep_io_types=True)
+                model.save_model_to_file(candidate_path)
+                load_with_app_providers(candidate_path)
+            except Exception as e:
+                print(f"   ⚠️ {filename}: {precision.upper()} fused graph rejected ({e})")
+                if os.path.exists(candidate_path):
+                    os.remove(candidate_path)
+                continue
+
+            os.replace(candidate_path, filepath)
+            precisions[filename] = precision
+            fused = ', '.join(f"{op}={count}" for op, count in model.get_fused_operator_statistics().items() if count)
+            print(f"   ✓ {filename} ({precision.upper()}): {fused or 'no fusions'}")
+            break
+        else:
+            print(f"   ⚠️ {filename}: keeping unfused FP32 graph")
+
+    return precisions
+
+
+def enable_hf_transfer():
+    """
+    Use the hf_transfer (Rust, multi-connection) backend for Hugging Face downloads
+
+    Only enabled when hf_transfer is installed. Must run before huggingface_hub
+    is imported, since the flag is read at import time.
+    """
+    try:
+        import hf_transfer  # noqa: F401
+    except ImportError:
+        return False
+
+    os.environ.setdefault('HF_HUB_ENABLE_HF_TRANSFER', '1')
+    return True
+
+
+def convert_whisper_model(model_id, output_dir, optimize=True, fp16=False):
     """
     Convert a Whisper model (Hugging Face Transformers) to ONNX format
     """
+    if enable_hf_transfer():
+        print("⚡ Using hf_transfer for Hugging Face downloads")
+
     try:
         from optimum.exporters.onnx import main_export
-        from transformers import AutoProcessor
+        from transformers import AutoConfig, AutoProcessor
         import onnx
     except ImportError:
         print("❌ Required packages not installed")
@@ -214,6 +924,30 @@ def convert_whisper_model(model_id, output_dir, optimize=True):
         print("✅ Export complete!")
         print("")
 
+        precision = {}  # filename -> 'fp16' | 'fp32', filled by the fusion pass
+        static_encoder = None
+        if optimize:
+            onnx_files = ['encoder_model.onnx', 'decoder_model.onnx', 'decoder_with_past_model.onnx']
+            print("🚀 Optimizing ONNX graphs (onnxsim + shape inference)...")
+            simplify_onnx_models(output_dir, onnx_files)
+            print("")
+
+            print("📐 Specializing encoder for 30 s input...")
+            n_mels = getattr(AutoConfig.from_pretrained(model_id), 'num_mel_bins', 80)
+            static_encoder = export_static_encoder(output_dir, n_mels)
+            if static_encoder:
+                onnx_files.append(static_encoder)
+            print("")
+
+            print(f"🚀 Fusing transformer ops (ONNX Runtime optimizer{', FP16 weights' if fp16 else ''})...")
+            precision = fuse_transformer_models(output_dir, onnx_files, model_id, fp16)
+            print("")
+
+        exported_files = ['encoder_model.onnx', 'decoder_model.onnx', 'decoder_with_past_model.onnx']
+        if static_encoder:
+            exported_files.append(static_encoder)
+        external_data = externalize_large_models(output_dir, exported_files)
+
         # Create config for inference engine
         config = {
             'model_type': 'encoder-decoder',
@@ -221,32 +955,25 @@ def convert_whisper_model(model_id, output_dir, optimize=True):
             'files': {
                 'encoder': 'encoder_model.onnx',
                 'decoder': 'decoder_model.onnx',
-                'decoder_with_past': 'decoder_with_past_model.onnx'
+                'decoder_with_past': 'decoder_with_past_model.onnx',
+                'encoder_static': static_encoder
             },
             'sample_rate': 16000,
             'feature_dim': 80,
-            'max_length': 448
+            'max_length': 448,
+            'precision': {f: precision.get(f, 'fp32') for f in exported_files},
+            'external_data': external_data,
+            **session_hints()
         }
         
-        config_path = os.path.join(output_dir, 'config.json')
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+        write_config(output_dir, config)
 
         # Validate all required files exist
-        print("🔍 Validating ONNX files...")
-        required_files = ['encoder_model.onnx', 'decoder_model.onnx', 'decoder_with_past_model.onnx']
-
-        for filename in required_files:
-            filepath = os.path.join(output_dir, filename)
-            if not os.path.exists(filepath):
-                raise RuntimeError(f"Missing required ONNX file: {filename}")
-
-            model = onnx.load(filepath)
-            if not model.graph:
-                raise RuntimeError(f"Invalid ONNX model (no graph): {filename}")
-
-            file_size_mb = os.path.getsize(filepath) / (1024 * 1024)
-            print(f"   ✓ {filename}: {len(model.graph.node)} nodes, {file_size_mb:.1f} MB")
+        validate_model_files(
+            output_dir,
+            ['encoder_model.onnx', 'decoder_model.onnx', 'decoder_with_past_model.onnx'],
+            check_graph=True
+        )
 
         print("")
         print("✅ All ONNX files validated successfully!")
@@ -255,7 +982,11 @@ def convert_whisper_model(model_id, output_dir, optimize=True):
         if optimize:
             print("")
             print("🚀 Optimization notes:")
-            print("   ✓ ONNX Runtime graph optimizations applied during export")
+            print("   ✓ Graphs simplified with onnxsim (when installed)")
+            print("   ✓ Attention / LayerNorm fused where the result loads with the app's providers")
+            fp16_files = [f for f, p in precision.items() if p == 'fp16']
+            if fp16_files:
+                print(f"   ✓ FP16 weights (float32 inputs/outputs): {', '.join(fp16_files)}")
             print("   ✓ CoreML execution provider will be used on Apple Silicon")
             print("   ✓ KV cache optimization enabled (decoder_with_past)")
 
@@ -268,14 +999,14 @@ def convert_whisper_model(model_id, output_dir, optimize=True):
         return False
 
 
-def convert_model(model_id, output_dir, optimize=True):
+def convert_model(model_id, output_dir, optimize=True, fp16=False, int8=False):
     """
     Convert a model to ONNX format - auto-detects model type
     """
     if is_parakeet_model(model_id):
-        return download_parakeet_onnx(model_id, output_dir)
+        return download_parakeet_onnx(model_id, output_dir, int8)
     else:
-        return convert_whisper_model(model_id, output_dir, optimize)
+        return convert_whisper_model(model_id, output_dir, optimize, fp16)
 
 
 def main():
@@ -298,6 +1029,16 @@ def main():
         action="store_true",
         help="Skip optimization step"
     )
+    parser.add_argument(
+        "--fp16",
+        action="store_true",
+        help="Store Whisper weights in FP16 (halves model size; recommended for CoreML)"
+    )
+    parser.add_argument(
+        "--int8",
+        action="store_true",
+        help="Quantize FP32 Parakeet models to INT8 (per-channel, MatMul/Gemm only)"
+    )
 
     args = parser.parse_args()
 
@@ -312,7 +1053,9 @@ def main():
     success = convert_model(
         args.model,
         output_dir,
-        optimize=not args.no_optimize
+        optimize=not args.no_optimize,
+        fp16=args.fp16,
+        int8=args.int8
     )
 
     if success:
@@ -5,13 +5,104 @@ Extract mel-spectrogram features from audio for speech recognition models
 This script is called by the Node.js inference engine to preprocess audio.
 """
 
+import os
 import sys
 import json
+import math
 import numpy as np
 
-def extract_mel_spectrogram(audio_path, n_mels=80, n_fft=400, hop_length=160, sr=16000):
+from _output import write_json
+
+# Intra-op threads for the STFT/mel kernels (frames are processed in parallel)
+NUM_THREADS = min(4, os.cpu_count() or 1)
+
+# Set before torch is imported: idle daemon threads sleep instead of spinning
+os.environ.setdefault("OMP_WAIT_POLICY", "PASSIVE")
+os.environ.setdefault("OMP_NUM_THREADS", str(NUM_THREADS))
+
+# Mel transforms cached per parameter set (filterbank and STFT window built once)
+_MEL_TRANSFORMS = {}
+
+# Filterbank sizes requested by the inference engine (Whisper, Parakeet)
+PREWARM_N_MELS = (80, 128)
+
+
+def get_mel_transform(n_mels, n_fft, hop_length, sr):
+    """
+    Return a cached torchaudio MelSpectrogram configured like librosa's defaults
+    (Slaney mel scale and norm, centered frames with zero padding)
     """
-    Extract log-mel spectrogram features from audio file
+    import torchaudio
+
+    key = (n_mels, n_fft, hop_length, sr)
+    transform = _MEL_TRANSFORMS.get(key)
+    if transform is None:
+        transform = torchaudio.transforms.MelSpectrogram(
+            sample_rate=sr,
+            n_fft=n_fft,
+            hop_length=hop_length,
+            n_mels=n_mels,
+            f_min=0.0,
+            f_max=8000.0,  # Typical for speech
+            power=2.0,
+            center=True,
+            pad_mode='constant',
+            norm='slaney',
+            mel_scale='slaney'
+        )
+        _MEL_TRANSFORMS[key] = transform
+    return transform
+
+
+def import_backend():
+    """
+    Import the audio/feature libraries, reporting a JSON error if missing
+
+    Returns:
+        Tuple of (soundfile, torch, torchaudio) modules
+    """
+    try:
+        import soundfile
+        import torch
+        import torchaudio
+    except ImportError as e:
+        write_error(f'{e.name} not installed', 'Install with: pip3 install soundfile torch torchaudio')
+        sys.exit(1)
+
+    if torch.get_num_threads() != NUM_THREADS:
+        torch.set_num_threads(NUM_THREADS)
+
+    return soundfile, torch, torchaudio
+
+
+def load_audio(audio_path, sr):
+    """
+    Load audio as mono float32 at the target sample rate
+
+    Decodes with libsndfile and resamples with torchaudio; formats
+    libsndfile can't read fall back to the shared pydub/ffmpeg loader.
+    """
+    soundfile, torch, torchaudio = import_backend()
+
+    try:
+        audio, file_sr = soundfile.read(audio_path, dtype='float32', always_2d=False)
+    except soundfile.LibsndfileError:
+        from _audio import load_audio as decode_audio
+        audio, _ = decode_audio(audio_path, sr)
+        return audio
+
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1, dtype=np.float32)
+
+    if file_sr != sr:
+        audio = torchaudio.functional.resample(torch.from_numpy(audio), file_sr, sr).numpy()
+
+    return audio
+
+
+def compute_mel_spectrogram(audio_path, n_mels=80, n_fft=400, hop_length=160, sr=16000):
+    """
+    Compute log-mel spectrogram features from audio file
 
     Args:
         audio_path: Path to audio file
@@ -21,46 +112,72 @@ def extract_mel_spectrogram(audio_path, n_mels=80, n_fft=400, hop_length=160, sr
         sr: Target sample rate
 
     Returns:
-        Dictionary with features and shape
+        Tuple of (float32 array of shape (n_mels, T), duration in seconds)
     """
-    try:
-        import librosa
-    except ImportError:
-        print(json.dumps({
-            'error': 'librosa not installed',
-            'message': 'Install with: pip3 install librosa'
-        }))
-        sys.exit(1)
+    _, torch, _ = import_backend()
 
-    try:
-        # Load audio at target sample rate
-        audio, _ = librosa.load(audio_path, sr=sr, mono=True)
+    # Load audio at target sample rate
+    audio = load_audio(audio_path, sr)
 
-        # Compute mel spectrogram
-        mel_spec = librosa.feature.melspectrogram(
-            y=audio,
-            sr=sr,
-            n_fft=n_fft,
-            hop_length=hop_length,
-            n_mels=n_mels,
-            fmin=0,
-            fmax=8000  # Typical for speech
-        )
+    # No autograd bookkeeping: STFT, mel projection and dB run as plain kernels
+    with torch.inference_mode():
+        # Compute mel spectrogram (cached filterbank, native FFT)
+        waveform = torch.from_numpy(audio).contiguous()
+        mel_spec = get_mel_transform(n_mels, n_fft, hop_length, sr)(waveform)
+
+        # Convert to log scale (dB) in place on the mel buffer, equivalent to
+        # librosa.power_to_db(ref=np.max, top_db=80): relative to the max the
+        # peak is 0 dB, so the top_db floor is a fixed -80 dB clamp
+        ref_db = math.log10(max(float(mel_spec.max()), 1e-10))
+        log_mel = mel_spec.clamp_(min=1e-10).log10_().sub_(ref_db).mul_(10.0).clamp_(min=-80.0)
+
+    # Raw float32 payload instead of a JSON list (no per-float Python objects)
+    features = np.ascontiguousarray(log_mel.numpy(), dtype=np.float32)
 
-        # Convert to log scale (dB)
-        log_mel = librosa.power_to_db(mel_spec, ref=np.max)
+    return features, len(audio) / sr
 
-        # Convert to list for JSON serialization
-        features = log_mel.tolist()
 
-        # Return features and shape
-        result = {
-            'features': features,
-            'shape': [n_mels, len(features[0])],
-            'duration': len(audio) / sr
-        }
+def write_features(features, duration):
+    """
+    Write a one-line JSON header (shape, duration, dtype, nbytes) to stdout
+    followed by the raw float32 features in row-major (n_mels, T) order
+    """
+    header = {
+        'shape': list(features.shape),
+        'duration': duration,
+        'dtype': 'float32',
+        'nbytes': features.nbytes
+    }
+
+    write_json(header, flush=False)
+    # Write straight from the array's memory (no intermediate bytes copy)
+    sys.stdout.buffer.write(features.data)
+    sys.stdout.buffer.flush()
+
+
+def write_error(error, message):
+    """Write a JSON error header line to stdout"""
+    write_json({
+        'error': error,
+        'message': message
+    })
+
+
+def extract_mel_spectrogram(audio_path, n_mels=80, n_fft=400, hop_length=160, sr=16000):
+    """
+    Extract log-mel spectrogram features from audio file and write them to stdout
+    """
+    import_backend()
 
-        print(json.dumps(result))
+    try:
+        features, duration = compute_mel_spectrogram(
+            audio_path,
+            n_mels=n_mels,
+            n_fft=n_fft,
+            hop_length=hop_length,
+            sr=sr
+        )
+        write_features(features, duration)
 
     except Exception as e:
         print(json.dumps({
@@ -70,17 +187,65 @@ def extract_mel_spectrogram(audio_path, n_mels=80, n_fft=400, hop_length=160, sr
         sys.exit(1)
 
 
+def serve(n_mels=80, n_fft=400, hop_length=160, sr=16000):
+    """
+    Daemon mode: keep libraries and mel transforms loaded across requests
+
+    Reads one JSON request per line on stdin ({"audio_path": ..., "n_mels": ...})
+    and answers each with a framed response (see write_features / write_error).
+    """
+    import_backend()
+
+    # Build the filterbanks and windows before the first request arrives
+    for size in sorted({n_mels, *PREWARM_N_MELS}):
+        get_mel_transform(size, n_fft, hop_length, sr)
+
+    for line in iter(sys.stdin.readline, ''):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            request = json.loads(line)
+            features, duration = compute_mel_spectrogram(
+                request['audio_path'],
+                n_mels=request.get('n_mels', n_mels),
+                n_fft=request.get('n_fft', n_fft),
+                hop_length=request.get('hop_length', hop_length),
+                sr=request.get('sr', sr)
+            )
+        except Exception as e:
+            write_error(str(e), 'Failed to extract features')
+            continue
+
+        write_features(features, duration)
+
+
 def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='Extract mel-spectrogram features')
-    parser.add_argument('audio_path', help='Path to audio file')
+    parser.add_argument('audio_path', nargs='?', help='Path to audio file')
     parser.add_argument('--n_mels', type=int, default=80, help='Number of mel filterbanks')
     parser.add_argument('--n_fft', type=int, default=400, help='FFT window size')
     parser.add_argument('--hop_length', type=int, default=160, help='Hop length')
     parser.add_argument('--sr', type=int, default=16000, help='Sample rate')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Serve JSON requests from stdin instead of a single file')
     
     args = parser.parse_args()
+
+    if args.daemon:
+        serve(
+            n_mels=args.n_mels,
+            n_fft=args.n_fft,
+            hop_length=args.hop_length,
+            sr=args.sr
+        )
+        return
+
+    if not args.audio_path:
+        parser.error('audio_path is required unless --daemon is set')
     
     extract_mel_spectrogram(
         args.audio_path, 
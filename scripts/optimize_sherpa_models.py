@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Pre-optimize sherpa-onnx Parakeet INT8 graphs with ONNX Runtime
+
+Writes encoder/decoder/joiner .int8.opt.onnx next to the originals so the
+graph rewrites (constant folding, node fusions) are done once instead of on
+every recognizer creation. The saved graphs hold CPU-provider fusions from
+this onnxruntime release, so its version and the files that optimized
+successfully are recorded in optimized_models.json; transcribe_sherpa_vad.py
+only uses them with the CPU provider and when sherpa-onnx bundles the same
+onnxruntime version.
+
+Usage: python optimize_sherpa_models.py --model-dir <dir>
+"""
+
+import argparse
+import os
+import sys
+
+from _sherpa_common import read_optimized_metadata, sherpa_ort_version, write_optimized_metadata
+
+MODEL_FILES = ['encoder.int8.onnx', 'decoder.int8.onnx', 'joiner.int8.onnx']
+
+
+def optimized_path(filepath):
+    """encoder.int8.onnx -> encoder.int8.opt.onnx"""
+    return filepath[:-len('.onnx')] + '.opt.onnx'
+
+
+def optimize_model_file(filepath):
+    """
+    Serialize the ORT-optimized graph of one model
+
+    ORT_ENABLE_EXTENDED keeps the saved graph portable: ORT_ENABLE_ALL adds
+    layout transformations tied to the CPU that ran the optimization.
+    """
+    import onnxruntime as ort
+
+    sess_options = ort.SessionOptions()
+    sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+    sess_options.optimized_model_filepath = optimized_path(filepath)
+    ort.InferenceSession(filepath, sess_options, providers=['CPUExecutionProvider'])
+    return sess_options.optimized_model_filepath
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-optimize sherpa-onnx Parakeet INT8 models")
+    parser.add_argument("--model-dir", required=True, help="Directory containing *.int8.onnx files")
+    parser.add_argument("--force", action="store_true", help="Regenerate existing .opt.onnx files")
+    args = parser.parse_args()
+
+    try:
+        import onnxruntime
+    except ImportError:
+        print("❌ onnxruntime not installed")
+        print("Please run: pip3 install onnxruntime")
+        sys.exit(1)
+
+    print(f"🚀 Optimizing ONNX graphs in {args.model_dir}...")
+    # Graphs from another onnxruntime release are regenerated, not kept
+    previous = read_optimized_metadata(args.model_dir)
+    up_to_date = previous.get('onnxruntime') == onnxruntime.__version__
+    optimized = set(previous.get('files', [])) if up_to_date else set()
+    failed = False
+    for filename in MODEL_FILES:
+        filepath = os.path.join(args.model_dir, filename)
+        if not os.path.exists(filepath):
+            print(f"   ⚠️ {filename}: NOT FOUND")
+            failed = True
+            continue
+
+        if filename in optimized and os.path.exists(optimized_path(filepath)) and not args.force:
+            print(f"   ✓ {filename}: already optimized")
+            continue
+
+        optimized.discard(filename)
+        try:
+            output = optimize_model_file(filepath)
+            size_mb = os.stat(output).st_size / (1024 * 1024)
+            print(f"   ✓ {filename} -> {os.path.basename(output)} ({size_mb:.1f} MB)")
+            optimized.add(filename)
+        except Exception as e:
+            print(f"   ❌ {filename}: {e}")
+            failed = True
+
+    # Only successfully optimized files are listed: the others stay unused
+    write_optimized_metadata(args.model_dir, onnxruntime.__version__, optimized)
+
+    bundled = sherpa_ort_version()
+    if bundled != onnxruntime.__version__:
+        print(f"   ⚠️ onnxruntime {onnxruntime.__version__} here, sherpa-onnx bundles {bundled or 'unknown'}:"
+              " the .opt.onnx files will be ignored")
+
+    if failed:
+        sys.exit(1)
+
+    print("✅ Optimized models ready")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Specialize Parakeet transducer graphs for greedy decoding
+
+- joiner.argmax.onnx: the logits are sliced to the token vocabulary (the TDT
+  joiner also emits duration logits after it) and reduced with ArgMax inside
+  the graph, so each joiner call returns one int64 token id per frame instead
+  of a full vocab-sized float tensor.
+- decoder.step.onnx: the prediction network fixed to one token per call;
+  target_length becomes a constant and every dynamic dimension is pinned to 1,
+  so ORT can constant-fold the length/slice logic and plan static shapes.
+
+Each file is checked against the graph it was derived from on a fixed
+fixture (onnxruntime) and deleted if the outputs differ.
+inferenceEngine.js picks both files up automatically when present.
+
+Usage: python specialize_transducer.py --model-dir <dir>
+"""
+
+import argparse
+import os
+import sys
+
+ARGMAX_OUTPUT = 'token_ids'
+
+# Parity fixture: same layouts the app feeds (inferenceEngine.js)
+FIXTURE_SEED = 0
+FIXTURE_FRAMES = 16
+FIXTURE_TOKENS = [0, 1, 2]
+
+ORT_DTYPES = {'tensor(float)': 'float32', 'tensor(int32)': 'int32', 'tensor(int64)': 'int64'}
+
+
+def models_dir(model_dir):
+    """ONNX files live in <model_dir>/onnx for HuggingFace layouts"""
+    onnx_subdir = os.path.join(model_dir, 'onnx')
+    return onnx_subdir if os.path.isdir(onnx_subdir) else model_dir
+
+
+def count_tokens(tokens_path):
+    """Number of entries in tokens.txt (blank included)"""
+    with open(tokens_path, 'r', encoding='utf-8') as f:
+        return sum(1 for line in f if line.strip())
+
+
+def add_argmax(joiner_path, output_path, num_tokens):
+    """
+    Replace the joiner's logits output with Slice(0:num_tokens) -> ArgMax
+
+    Logits are [batch, T, U, vocab]; the new output is [batch, T, U] int64.
+    """
+    import onnx
+    from onnx import TensorProto, helper
+
+    model = onnx.load(joiner_path)
+    graph = model.graph
+    logits = graph.output[0].name
+    # Newer checkers require a shape on graph outputs: logits dims minus vocab
+    logits_dims = graph.output[0].type.tensor_type.shape.dim
+    token_ids_shape = [
+        d.dim_param or (d.dim_value if d.HasField('dim_value') else None)
+        for d in logits_dims[:-1]
+    ] if len(logits_dims) > 1 else None
+
+    constants = {
+        'argmax_slice_starts': [0],
+        'argmax_slice_ends': [num_tokens],
+        'argmax_slice_axes': [-1],
+    }
+    for name, values in constants.items():
+        graph.initializer.append(helper.make_tensor(name, TensorProto.INT64, [1], values))
+
+    graph.node.extend([
+        helper.make_node(
+            'Slice',
+            [logits, 'argmax_slice_starts', 'argmax_slice_ends', 'argmax_slice_axes'],
+            ['token_logits'],
+            name='argmax_slice'
+        ),
+        helper.make_node('ArgMax', ['token_logits'], [ARGMAX_OUTPUT], name='argmax', axis=-1, keepdims=0),
+    ])
+
+    del graph.output[:]
+    graph.output.append(helper.make_tensor_value_info(ARGMAX_OUTPUT, TensorProto.INT64, token_ids_shape))
+
+    onnx.checker.check_model(model)
+    onnx.save(model, output_path)
+    return output_path
+
+
+def make_decoder_step(decoder_path, output_path):
+    """
+    Fold target_length to the constant [1] and pin dynamic dims to 1
+
+    The decode loop only ever feeds one token (targets [1, 1]) with batch 1,
+    so the graph keeps targets and the LSTM state inputs, now statically shaped.
+    """
+    import onnx
+    from onnx import numpy_helper
+    import numpy as np
+
+    model = onnx.load(decoder_path)
+    graph = model.graph
+
+    length_input = next((i for i in graph.input if 'length' in i.name), None)
+    if length_input is None:
+        raise ValueError("decoder has no target length input")
+
+    dtype = onnx.helper.tensor_dtype_to_np_dtype(length_input.type.tensor_type.elem_type)
+    graph.initializer.append(numpy_helper.from_array(np.ones([1], dtype=dtype), name=length_input.name))
+    graph.input.remove(length_input)
+
+    for value in list(graph.input) + list(graph.output):
+        for dim in value.type.tensor_type.shape.dim:
+            if not dim.HasField('dim_value'):
+                dim.dim_value = 1
+
+    model = onnx.shape_inference.infer_shapes(model)
+    onnx.checker.check_model(model)
+    onnx.save(model, output_path)
+    return output_path
+
+
+def _session(path):
+    import onnxruntime as ort
+    return ort.InferenceSession(path, providers=['CPUExecutionProvider'])
+
+
+def _input_types(session):
+    return {i.name: ORT_DTYPES[i.type] for i in session.get_inputs()}
+
+
+def check_decoder_step(decoder_path, step_path):
+    """
+    Run decoder.onnx and decoder.step.onnx on the same token/state sequence
+    Raises ValueError if any output or state differs (allclose).
+    """
+    import numpy as np
+
+    reference = _session(decoder_path)
+    step = _session(step_path)
+    types = _input_types(reference)
+    shapes = {i.name: [d if isinstance(d, int) else 1 for d in i.shape] for i in reference.get_inputs()}
+
+    # Same input/output roles as resolveDecoderIO() in inferenceEngine.js
+    names = list(types)
+    targets = 'targets' if 'targets' in names else names[0]
+    length = next(name for name in names if name != targets and 'length' in name)
+    states = [name for name in names if name not in (targets, length)]
+    output_names = [o.name for o in reference.get_outputs()]
+    main_output = 'outputs' if 'outputs' in output_names else output_names[0]
+    state_outputs = [name for name in output_names if name != main_output and 'length' not in name]
+
+    rng = np.random.default_rng(FIXTURE_SEED)
+    state = {name: rng.standard_normal(shapes[name]).astype(types[name]) for name in states}
+
+    for token in FIXTURE_TOKENS:
+        feeds = {
+            targets: np.array([[token]], dtype=types[targets]),
+            length: np.array([1], dtype=types[length]),
+            **state,
+        }
+        expected = reference.run(output_names, feeds)
+        actual = step.run(output_names, {i.name: feeds[i.name] for i in step.get_inputs()})
+        for name, want, got in zip(output_names, expected, actual):
+            if want.shape != got.shape or not np.allclose(want, got, rtol=1e-4, atol=1e-5):
+                raise ValueError(f"decoder output {name} differs for token {token}")
+        # Chain the reference states so later steps start from a real state
+        expected = dict(zip(output_names, expected))
+        state = {name: expected[output] for name, output in zip(states, state_outputs)}
+
+
+def check_joiner_argmax(joiner_path, argmax_path, num_tokens):
+    """
+    token_ids must equal argmax(joiner.onnx logits[..., :num_tokens])
+
+    That is the app's logits path, so both joiners decode identically.
+    Raises ValueError on mismatch, or if tokens.txt lists more tokens than
+    the joiner scores.
+    """
+    import numpy as np
+
+    reference = _session(joiner_path)
+    argmax = _session(argmax_path)
+    shapes = {i.name: i.shape for i in reference.get_inputs()}
+
+    rng = np.random.default_rng(FIXTURE_SEED)
+    feeds = {
+        'encoder_outputs': rng.standard_normal([1, shapes['encoder_outputs'][1], FIXTURE_FRAMES]).astype(np.float32),
+        'decoder_outputs': rng.standard_normal([1, shapes['decoder_outputs'][1], 1]).astype(np.float32),
+    }
+
+    logits = reference.run(None, feeds)[0]
+    if logits.shape[-1] < num_tokens:
+        raise ValueError(f"tokens.txt has {num_tokens} tokens, joiner scores {logits.shape[-1]}")
+
+    expected = logits[..., :num_tokens].argmax(axis=-1)
+    actual = argmax.run([ARGMAX_OUTPUT], feeds)[0]
+    if actual.shape != expected.shape or not np.array_equal(actual, expected):
+        raise ValueError("ArgMax joiner token ids differ from joiner.onnx")
+
+
+def write_verified(build, check, source_path, target_path):
+    """Write target_path from source_path; deleted again unless check passes"""
+    build(source_path, target_path)
+    try:
+        check(source_path, target_path)
+    except Exception:
+        if os.path.exists(target_path):
+            os.remove(target_path)
+        raise
+    return target_path
+
+
+def specialization_jobs(tokens_path):
+    """(config key, source, target, build, check) for each specialized graph"""
+    num_tokens = count_tokens(tokens_path)
+    return [
+        ('joiner_argmax', 'joiner.onnx', 'joiner.argmax.onnx',
+         lambda src, dst: add_argmax(src, dst, num_tokens),
+         lambda src, dst: check_joiner_argmax(src, dst, num_tokens)),
+        ('decoder_step', 'decoder.onnx', 'decoder.step.onnx', make_decoder_step, check_decoder_step),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Specialize Parakeet transducer graphs for greedy decoding")
+    parser.add_argument("--model-dir", required=True, help="Directory containing joiner.onnx, decoder.onnx and tokens.txt")
+    parser.add_argument("--force", action="store_true", help="Regenerate existing specialized graphs")
+    args = parser.parse_args()
+
+    try:
+        import onnx  # noqa: F401
+        import onnxruntime  # noqa: F401
+    except ImportError as e:
+        print(f"❌ {e.name} not installed")
+        print("Please run: pip3 install onnx onnxruntime")
+        sys.exit(1)
+
+    onnx_dir = models_dir(args.model_dir)
+    tokens_path = os.path.join(args.model_dir, 'tokens.txt')
+
+    if not os.path.exists(tokens_path):
+        print("❌ tokens.txt: NOT FOUND")
+        sys.exit(1)
+
+    print(f"🚀 Specializing transducer graphs in {onnx_dir}...")
+    failed = False
+    for _, source, target, build, check in specialization_jobs(tokens_path):
+        source_path = os.path.join(onnx_dir, source)
+        target_path = os.path.join(onnx_dir, target)
+        if not os.path.exists(source_path):
+            print(f"   ⚠️ {source}: NOT FOUND")
+            failed = True
+            continue
+
+        if os.path.exists(target_path) and not args.force:
+            print(f"   ✓ {target}: already exists")
+            continue
+
+        try:
+            write_verified(build, check, source_path, target_path)
+            print(f"   ✓ {source} -> {target} (outputs match)")
+        except Exception as e:
+            print(f"   ❌ {source}: {e}")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+    print("✅ Specialized graphs ready")
+
+
+if __name__ == "__main__":
+    main()
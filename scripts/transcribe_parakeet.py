@@ -2,76 +2,120 @@
 """
 Script d'inférence pour Parakeet TDT v3 via NeMo
 Utilisé par l'app Electron via subprocess pour transcription audio
+
+Modes :
+- transcribe_parakeet.py <audio_path>           un fichier, JSON sur stdout
+- transcribe_parakeet.py <audio> <audio> ...    plusieurs fichiers en un seul passage batché
+- transcribe_parakeet.py --serve                modèle chargé une fois, puis {"ready": true}
+                                                sur stdout ; une ligne JSON {"audio_path": ...}
+                                                par requête sur stdin
+- transcribe_parakeet.py --batch-file <txt>     un chemin par ligne, transcription par lots
 """
 
-import sys
+import argparse
 import json
+import sys
 import os
 from pathlib import Path
 
-def transcribe_audio(audio_path, model_name="nvidia/parakeet-tdt-0.6b-v3"):
+# Threads OpenMP fixés avant l'import de torch/NeMo (pas d'attente active)
+os.environ.setdefault("OMP_WAIT_POLICY", "PASSIVE")
+os.environ.setdefault("OMP_NUM_THREADS", str(max(1, min(4, (os.cpu_count() or 2) // 2))))
+
+from _output import write_json
+
+DEFAULT_MODEL = "nvidia/parakeet-tdt-0.6b-v3"
+
+# Le transducer NeMo traite nativement plusieurs fichiers par passe ; ~4 est
+# le meilleur compromis débit/précision pour l'encodeur FastConformer
+BATCH_SIZE = 4
+
+
+def load_model(model_name=DEFAULT_MODEL):
+    """Charge le modèle NeMo (utilisera le cache HuggingFace)"""
+    import nemo.collections.asr as nemo_asr
+
+    model = nemo_asr.models.EncDecRNNTBPEModel.from_pretrained(
+        model_name=model_name
+    )
+    model.eval()
+    return model
+
+
+def prepare_input(audio_path):
+    """
+    Entrée pour model.transcribe : chemin pour un WAV, samples float32 16 kHz sinon
+    Lève FileNotFoundError si le fichier n'existe pas
+    """
+    from _audio import load_audio
+
+    audio_path = Path(audio_path)
+    if not audio_path.exists():
+        raise FileNotFoundError(f'Fichier audio non trouvé: {audio_path}')
+
+    if audio_path.suffix.lower() == '.wav':
+        return str(audio_path)
+
+    # Si MP3 ou autre format, décoder en mémoire (soundfile + soxr, mono 16 kHz)
+    # et passer les samples directement à NeMo (pas de WAV temporaire)
+    samples, _ = load_audio(audio_path)
+    return samples
+
+
+def hypothesis_text(result):
+    """result peut être un Hypothesis object ou une string"""
+    if hasattr(result, 'text'):
+        return result.text
+    return str(result)
+
+
+def transcribe_inputs(model, inputs, batch_size=BATCH_SIZE):
+    """
+    Transcrit une liste d'entrées (chemins et/ou samples) en préservant l'ordre
+    Chemins et tableaux sont envoyés dans des appels séparés à NeMo
+    """
+    texts = [None] * len(inputs)
+    paths = [i for i, item in enumerate(inputs) if isinstance(item, str)]
+    arrays = [i for i, item in enumerate(inputs) if not isinstance(item, str)]
+
+    for indices in (paths, arrays):
+        if not indices:
+            continue
+        transcriptions = model.transcribe([inputs[i] for i in indices], batch_size=batch_size)
+        for i, result in zip(indices, transcriptions or []):
+            texts[i] = hypothesis_text(result)
+
+    return texts
+
+
+def transcribe_audio(audio_path, model_name=DEFAULT_MODEL, model=None):
     """
     Transcrit un fichier audio avec Parakeet TDT v3
-    
+
     Args:
         audio_path: Chemin vers fichier audio (WAV, MP3, etc.)
         model_name: ID HuggingFace du modèle
-        
+        model: Modèle déjà chargé (mode --serve), sinon chargé ici
+
     Returns:
         dict avec 'success', 'text', et optionnel 'error'
     """
     try:
-        import nemo.collections.asr as nemo_asr
-        from pydub import AudioSegment
-        import tempfile
-        
-        # Charger le modèle (utilisera le cache HuggingFace)
-        model = nemo_asr.models.EncDecRNNTBPEModel.from_pretrained(
-            model_name=model_name
-        )
-        model.eval()
-        
-        # Convertir en WAV si nécessaire
-        audio_path = Path(audio_path)
-        if not audio_path.exists():
+        if model is None:
+            model = load_model(model_name)
+
+        try:
+            transcribe_input = prepare_input(audio_path)
+        except FileNotFoundError as e:
             return {
                 'success': False,
-                'error': f'Fichier audio non trouvé: {audio_path}'
+                'error': str(e)
             }
-        
-        # Si MP3 ou autre format, convertir en WAV temporaire
-        temp_wav = None
-        if audio_path.suffix.lower() != '.wav':
-            audio = AudioSegment.from_file(str(audio_path))
-            audio = audio.set_channels(1)  # Mono
-            audio = audio.set_frame_rate(16000)  # 16kHz
-            
-            # Créer fichier temporaire
-            temp_wav = tempfile.NamedTemporaryFile(
-                suffix='.wav',
-                delete=False
-            )
-            audio.export(temp_wav.name, format='wav')
-            transcribe_path = temp_wav.name
-        else:
-            transcribe_path = str(audio_path)
-        
+
         # Transcription
-        transcriptions = model.transcribe([transcribe_path])
-        
-        # Nettoyer fichier temporaire
-        if temp_wav:
-            os.unlink(temp_wav.name)
-        
-        # Extraire le texte du résultat
-        if transcriptions and len(transcriptions) > 0:
-            result = transcriptions[0]
-            # result peut être un Hypothesis object ou une string
-            if hasattr(result, 'text'):
-                text = result.text
-            else:
-                text = str(result)
-            
+        text = transcribe_inputs(model, [transcribe_input], batch_size=1)[0]
+
+        if text is not None:
             return {
                 'success': True,
                 'text': text
@@ -81,7 +125,7 @@ def transcribe_audio(audio_path, model_name="nvidia/parakeet-tdt-0.6b-v3"):
                 'success': False,
                 'error': 'Aucune transcription générée'
             }
-            
+
     except ImportError as e:
         return {
             'success': False,
@@ -94,21 +138,116 @@ def transcribe_audio(audio_path, model_name="nvidia/parakeet-tdt-0.6b-v3"):
         }
 
 
+def load_model_or_report(model_name):
+    """Charge le modèle ; en cas d'échec, écrit l'erreur JSON et quitte"""
+    try:
+        return load_model(model_name)
+    except ImportError as e:
+        error = f'Dépendances manquantes: {str(e)}. Installez avec: uv sync'
+    except Exception as e:
+        error = f'Erreur chargement modèle: {str(e)}'
+
+    write_json({'success': False, 'error': error})
+    sys.exit(1)
+
+
+def serve(model_name):
+    """
+    Mode daemon : modèle chargé une fois, puis une requête JSON par ligne
+    Requête : {"audio_path": "..."} -> Réponse : {"success": ..., "text"|"error": ...}
+    """
+    model = load_model_or_report(model_name)
+    print("✓ Daemon prêt", file=sys.stderr)
+    # Signal à l'app : le délai des requêtes ne court qu'à partir d'ici
+    write_json({'ready': True})
+
+    for line in iter(sys.stdin.readline, ''):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            request = json.loads(line)
+            result = transcribe_audio(request['audio_path'], model=model)
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+
+        write_json(result)
+
+
+def transcribe_files(audio_paths, model_name, batch_size=BATCH_SIZE):
+    """
+    Transcrit plusieurs fichiers par lots, entrées préparées en amont
+    Écrit une ligne JSON par fichier, dans l'ordre donné
+    """
+    model = load_model_or_report(model_name)
+
+    inputs = {}
+    results = {}
+    for audio_path in audio_paths:
+        try:
+            inputs[audio_path] = prepare_input(audio_path)
+        except Exception as e:
+            results[audio_path] = {'success': False, 'error': str(e)}
+
+    paths = list(inputs)
+    try:
+        texts = transcribe_inputs(model, [inputs[p] for p in paths], batch_size=batch_size)
+        for audio_path, text in zip(paths, texts):
+            if text is None:
+                results[audio_path] = {'success': False, 'error': 'Aucune transcription générée'}
+            else:
+                results[audio_path] = {'success': True, 'text': text}
+    except Exception as e:
+        for audio_path in paths:
+            results[audio_path] = {'success': False, 'error': f'Erreur transcription: {str(e)}'}
+
+    for audio_path in audio_paths:
+        write_json({'audio_path': audio_path, **results[audio_path]})
+
+    return all(results[p]['success'] for p in audio_paths)
+
+
+def transcribe_batch_file(batch_file, model_name, batch_size=BATCH_SIZE):
+    """Transcrit tous les fichiers listés dans batch_file (un chemin par ligne)"""
+    with open(batch_file, 'r', encoding='utf-8') as f:
+        audio_paths = [line.strip() for line in f if line.strip()]
+
+    return transcribe_files(audio_paths, model_name, batch_size)
+
+
 def main():
     """Point d'entrée CLI"""
-    if len(sys.argv) < 2:
-        print(json.dumps({
+    parser = argparse.ArgumentParser(description="Transcription avec Parakeet TDT via NeMo")
+    parser.add_argument("audio_paths", nargs='*', help="Fichier(s) audio (WAV, MP3, etc.)")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="ID HuggingFace du modèle")
+    parser.add_argument("--serve", action="store_true", help="Garder le modèle chargé et lire les requêtes JSON sur stdin")
+    parser.add_argument("--batch-file", help="Fichier texte listant les fichiers audio (un par ligne)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help=f"Taille de lot NeMo (défaut: {BATCH_SIZE})")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.model)
+        return
+
+    if args.batch_file:
+        sys.exit(0 if transcribe_batch_file(args.batch_file, args.model, args.batch_size) else 1)
+
+    if len(args.audio_paths) > 1:
+        sys.exit(0 if transcribe_files(args.audio_paths, args.model, args.batch_size) else 1)
+
+    if not args.audio_paths:
+        write_json({
             'success': False,
             'error': 'Usage: transcribe_parakeet.py <audio_path>'
-        }))
+        })
         sys.exit(1)
-    
-    audio_path = sys.argv[1]
-    result = transcribe_audio(audio_path)
-    
+
+    result = transcribe_audio(args.audio_paths[0], args.model)
+
     # Retourner JSON sur stdout
-    print(json.dumps(result))
-    
+    write_json(result)
+
     # Exit code selon succès
     sys.exit(0 if result['success'] else 1)
 
@@ -2,27 +2,58 @@
 """
 Transcription audio avec Parakeet INT8 via sherpa-onnx + VAD chunking
 Usage: python transcribe_sherpa_vad.py <audio_file>
+       python transcribe_sherpa_vad.py --daemon --model-dir <dir>
 Output: JSON avec success et text
+
+En mode --daemon, le modèle et le VAD sont chargés une seule fois, puis
+{"ready": true} est écrit sur stdout ; chaque ligne JSON {"audio_path": ...}
+lue sur stdin produit ensuite une ligne JSON sur stdout.
 """
 
 import argparse
 import json
 import os
 import sys
-import numpy as np
+
+# Threads ORT/OpenMP, fixés avant l'import de sherpa-onnx : pas d'attente active
+# entre deux requêtes (mode daemon) ni de sursouscription des cœurs
+NUM_THREADS = max(1, min(4, (os.cpu_count() or 2) // 2))
+os.environ.setdefault("OMP_WAIT_POLICY", "PASSIVE")
+os.environ.setdefault("OMP_NUM_THREADS", str(NUM_THREADS))
+
 from pathlib import Path
 import re
 
-try:
-    import sherpa_onnx
-    import soundfile as sf
-    import torch
-except ImportError as e:
-    print(json.dumps({
-        "success": False,
-        "error": f"Dépendance manquante: {e}. Installez avec: uv add sherpa-onnx soundfile torch"
-    }))
-    sys.exit(1)
+from _output import write_json
+
+# Backends importés par lazy_import() une fois les arguments validés :
+# --help et les erreurs d'usage ne paient pas le chargement de sherpa-onnx
+sherpa_onnx = None
+load_audio = None
+build_recognizer = None
+build_online_recognizer = None
+
+
+def lazy_import():
+    """Importe sherpa-onnx et le chargeur audio ; erreur JSON si absents"""
+    global sherpa_onnx, load_audio, build_recognizer, build_online_recognizer
+    try:
+        import sherpa_onnx
+        from _audio import load_audio
+        from _sherpa_common import build_recognizer, build_online_recognizer
+    except ImportError as e:
+        write_json({
+            "success": False,
+            "error": f"Dépendance manquante: {e}. Installez avec: uv add sherpa-onnx soundfile soxr"
+        })
+        sys.exit(1)
+
+
+# Interjections isolées (Uh, Euh, Hum, ...), compilées une fois en une seule alternance
+_INTERJECTION = r'\b(?:Uh+|Euh+|Hum+|Hmm+|Er+|Um+|Ah+|Oh+)\b'
+_INTERJECTION_FOLLOWED = re.compile(_INTERJECTION + r'[,\.]?\s+', re.IGNORECASE)
+_INTERJECTION_SURROUNDED = re.compile(r'\s+' + _INTERJECTION + r'\s+', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
 
 
 def post_process_text(text):
@@ -35,18 +66,12 @@ def post_process_text(text):
     if not text or not isinstance(text, str):
         return text
     
-    # Supprimer les interjections isolées
-    interjections = [
-        r'\bUh+\b', r'\bEuh+\b', r'\bHum+\b', r'\bHmm+\b',
-        r'\bEr+\b', r'\bUm+\b', r'\bAh+\b', r'\bOh+\b'
-    ]
-    
-    for pattern in interjections:
-        text = re.sub(pattern + r'[,\.]?\s+', ' ', text, flags=re.IGNORECASE)
-        text = re.sub(r'\s+' + pattern + r'\s+', ' ', text, flags=re.IGNORECASE)
+    # Supprimer les interjections isolées (une passe par motif fusionné)
+    text = _INTERJECTION_FOLLOWED.sub(' ', text)
+    text = _INTERJECTION_SURROUNDED.sub(' ', text)
     
     # Nettoyer les espaces multiples
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WHITESPACE.sub(' ', text).strip()
     
     # Majuscule au début
     if text:
@@ -59,9 +84,36 @@ def post_process_text(text):
     return text
 
 
+# CPU partout : les modèles *.int8.onnx reposent sur DynamicQuantizeLinear /
+# MatMulInteger, que l'EP CoreML ne prend pas en charge ; le graphe serait
+# découpé en nombreuses partitions CoreML/CPU, plus lentes, sans erreur.
+# --provider coreml reste disponible pour comparer.
+DEFAULT_PROVIDER = 'cpu'
+
+# Nombre de segments VAD décodés ensemble par decode_streams
+DECODE_BATCH_SIZE = 8
+# Écart de longueur max (relatif) entre segments d'un même lot
+BUCKET_TOLERANCE = 0.1
+
+# Silero VAD exporté en ONNX, exécuté par sherpa-onnx (pas de torch)
+SILERO_VAD_FILE = 'silero_vad.onnx'
+
+# Silence décodé au démarrage du daemon : longueur max d'un segment VAD, pour
+# que l'arène mémoire ORT atteigne sa taille de croisière avant la 1re requête
+WARMUP_SECONDS = 30
+
+# Sans VAD, au-delà de cette durée l'audio passe par le modèle streaming
+# (<model_dir>/online) s'il est installé, plutôt qu'un seul encodage géant
+ONLINE_MIN_SECONDS = 60
+ONLINE_SUBDIR = 'online'
+# Blocs envoyés au recognizer streaming (200 ms à 16 kHz)
+STREAM_CHUNK_SAMPLES = 3200
+
+
 def load_silero_vad():
-    """Charge le modèle Silero VAD"""
+    """Charge le modèle Silero VAD (PyTorch, via torch.hub)"""
     try:
+        import torch
         model, utils = torch.hub.load(repo_or_dir='snakers4/silero-vad',
                                       model='silero_vad',
                                       force_reload=False,
@@ -71,48 +123,144 @@ def load_silero_vad():
         raise Exception(f"Erreur chargement Silero VAD: {e}")
 
 
-def get_speech_timestamps(audio_samples, vad_model, sample_rate=16000, 
-                          min_speech_duration_ms=250, max_speech_duration_s=30):
+def load_recognizer(model_dir, provider='cpu'):
+    """Charge le modèle Parakeet INT8 via sherpa-onnx (voir _sherpa_common)"""
+    print(f"Chargement modèle Parakeet INT8 (provider: {provider})...", file=sys.stderr)
+    return build_recognizer(model_dir, num_threads=NUM_THREADS, provider=provider)
+
+
+def load_online_recognizer(model_dir, provider='cpu'):
+    """Recognizer streaming si <model_dir>/online existe, sinon None"""
+    online_dir = os.path.join(model_dir, ONLINE_SUBDIR)
+    if not os.path.isdir(online_dir):
+        return None
+
+    print("Chargement modèle streaming...", file=sys.stderr)
+    try:
+        return build_online_recognizer(online_dir, num_threads=NUM_THREADS, provider=provider)
+    except Exception as e:
+        print(f"⚠️  Modèle streaming non disponible: {e}", file=sys.stderr)
+        return None
+
+
+def warm_up(recognizer, sample_rate=16000):
+    """Décode WARMUP_SECONDS de silence (allocations et plans mémoire ORT)"""
+    import numpy as np
+
+    stream = recognizer.create_stream()
+    stream.accept_waveform(sample_rate, np.zeros(WARMUP_SECONDS * sample_rate, dtype=np.float32))
+    recognizer.decode_stream(stream)
+
+
+def load_onnx_vad(vad_path, sample_rate=16000):
     """
-    Détecte les segments de parole dans l'audio
+    Silero VAD ONNX via sherpa_onnx.VoiceActivityDetector
+    Retourne detect(samples, sample_rate) -> [{'start': ..., 'end': ...}] (en samples)
     """
-    # Silero VAD attend des samples en float32 normalisés
-    if audio_samples.dtype != np.float32:
-        audio_samples = audio_samples.astype(np.float32)
-    
-    # Convertir en tensor PyTorch
-    audio_tensor = torch.from_numpy(audio_samples)
-    
-    # Obtenir les timestamps
-    speech_timestamps = vad_model(audio_tensor, sample_rate)
-    
-    return speech_timestamps
+    config = sherpa_onnx.VadModelConfig()
+    config.silero_vad.model = vad_path
+    config.silero_vad.min_speech_duration = 0.25
+    config.silero_vad.max_speech_duration = 30
+    config.sample_rate = sample_rate
+    config.num_threads = 1
+
+    # Les segments sont retirés au fil de l'eau : le tampon n'a pas à contenir tout le fichier
+    detector = sherpa_onnx.VoiceActivityDetector(config, buffer_size_in_seconds=60)
+    window_size = config.silero_vad.window_size
+
+    def detect(samples, sample_rate):
+        detector.reset()
+        timestamps = []
+
+        def drain():
+            while not detector.empty():
+                segment = detector.front
+                timestamps.append({'start': segment.start, 'end': segment.start + len(segment.samples)})
+                detector.pop()
+
+        for offset in range(0, len(samples), window_size):
+            detector.accept_waveform(samples[offset:offset + window_size])
+            drain()
+        detector.flush()
+        drain()
+        return timestamps
+
+    return detect
+
+
+def load_torch_vad():
+    """Silero VAD PyTorch (repli si silero_vad.onnx est absent)"""
+    import torch
 
+    vad_model, vad_utils = load_silero_vad()
+    (get_speech_ts, _, _, _, _) = vad_utils
 
-def transcribe_with_sherpa_chunked(audio_file, model_dir):
+    def detect(samples, sample_rate):
+        return get_speech_ts(torch.from_numpy(samples), vad_model, sampling_rate=sample_rate)
+
+    return detect
+
+
+def load_vad(model_dir):
     """
-    Transcrit un fichier audio avec Parakeet INT8 via sherpa-onnx
-    Utilise VAD pour découper l'audio en segments
+    Charge Silero VAD : ONNX (sherpa-onnx) si <model_dir>/silero_vad.onnx existe, sinon torch.hub
+    Retourne detect(samples, sample_rate) ou None si indisponible
     """
-    # Charger Silero VAD
     print("Chargement du VAD...", file=sys.stderr)
+    vad_path = os.path.join(model_dir, SILERO_VAD_FILE)
+    if os.path.exists(vad_path):
+        try:
+            return load_onnx_vad(vad_path)
+        except Exception as e:
+            print(f"⚠️  VAD ONNX non disponible, repli sur torch: {e}", file=sys.stderr)
+
     try:
-        vad_model, vad_utils = load_silero_vad()
-        (get_speech_ts, _, _, _, _) = vad_utils
+        return load_torch_vad()
     except Exception as e:
         # Si VAD échoue, on continue sans chunking
         print(f"⚠️  VAD non disponible, transcription sans chunking: {e}", file=sys.stderr)
-        return transcribe_whole_file(audio_file, model_dir)
+        return None
+
+
+def bucket_segments(speech_timestamps, max_batch=DECODE_BATCH_SIZE, tolerance=BUCKET_TOLERANCE):
+    """
+    Regroupe les segments par longueur pour limiter le padding dans un lot
+    Tri par durée, puis lots d'au plus max_batch segments dont la longueur
+    reste à moins de tolerance (10 %) du plus court du lot.
+    Retourne une liste de lots d'indices (ordre d'origine à reconstruire).
+    """
+    lengths = [ts['end'] - ts['start'] for ts in speech_timestamps]
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+
+    buckets = []
+    current = []
+    for i in order:
+        if current and (len(current) == max_batch or lengths[i] > lengths[current[0]] * (1 + tolerance)):
+            buckets.append(current)
+            current = []
+        current.append(i)
+    if current:
+        buckets.append(current)
+    return buckets
+
+
+def transcribe_with_sherpa_chunked(audio_file, recognizer, vad, online_recognizer=None):
+    """
+    Transcrit un fichier audio avec Parakeet INT8 via sherpa-onnx
+    Utilise VAD pour découper l'audio en segments
+    """
+    if vad is None:
+        return transcribe_whole_file(audio_file, recognizer, online_recognizer)
     
     # Charger l'audio
     print(f"Chargement audio: {audio_file}", file=sys.stderr)
-    samples, sample_rate = sf.read(audio_file, dtype='float32')
+    samples, sample_rate = load_audio(audio_file)
     duration = len(samples) / sample_rate
     print(f"Audio: {duration:.2f}s, {sample_rate}Hz", file=sys.stderr)
     
     # Détecter les segments de parole
     print("Détection segments de parole...", file=sys.stderr)
-    speech_timestamps = get_speech_ts(torch.from_numpy(samples), vad_model, sampling_rate=sample_rate)
+    speech_timestamps = vad(samples, sample_rate)
     
     if not speech_timestamps:
         print("⚠️  Aucun segment de parole détecté", file=sys.stderr)
@@ -120,57 +268,57 @@ def transcribe_with_sherpa_chunked(audio_file, model_dir):
     
     print(f"✓ {len(speech_timestamps)} segments détectés", file=sys.stderr)
     
-    # Charger le modèle sherpa-onnx
-    print("Chargement modèle Parakeet INT8...", file=sys.stderr)
-    recognizer = sherpa_onnx.OfflineRecognizer.from_transducer(
-        encoder=os.path.join(model_dir, 'encoder.int8.onnx'),
-        decoder=os.path.join(model_dir, 'decoder.int8.onnx'),
-        joiner=os.path.join(model_dir, 'joiner.int8.onnx'),
-        tokens=os.path.join(model_dir, 'tokens.txt'),
-        num_threads=4,
-        sample_rate=16000,
-        feature_dim=128,
-        model_type='nemo_transducer'
-    )
-    
-    # Transcrire chaque segment
+    # Transcrire les segments par lots de longueurs proches (un seul appel decode_streams par lot)
+    texts = [''] * len(speech_timestamps)
+    for bucket in bucket_segments(speech_timestamps):
+        streams = []
+        for i in bucket:
+            timestamp = speech_timestamps[i]
+            stream = recognizer.create_stream()
+            stream.accept_waveform(sample_rate, samples[timestamp['start']:timestamp['end']])
+            streams.append(stream)
+        recognizer.decode_streams(streams)
+
+        for i, stream in zip(bucket, streams):
+            texts[i] = stream.result.text.strip()
+
+    # Remettre les segments dans l'ordre chronologique
     transcriptions = []
-    for i, timestamp in enumerate(speech_timestamps):
-        start_sample = timestamp['start']
-        end_sample = timestamp['end']
-        
-        # Extraire le segment
-        segment = samples[start_sample:end_sample]
-        
-        # Transcrire le segment
-        stream = recognizer.create_stream()
-        stream.accept_waveform(sample_rate, segment)
-        recognizer.decode_stream(stream)
-        result = stream.result
-        
-        if result.text.strip():
-            transcriptions.append(result.text.strip())
-            print(f"  Segment {i+1}/{len(speech_timestamps)}: \"{result.text[:50]}...\"", file=sys.stderr)
+    for i, text in enumerate(texts):
+        if text:
+            transcriptions.append(text)
+            print(f"  Segment {i+1}/{len(speech_timestamps)}: \"{text[:50]}...\"", file=sys.stderr)
     
     # Combiner les transcriptions
     full_text = " ".join(transcriptions)
     return full_text
 
 
-def transcribe_whole_file(audio_file, model_dir):
+def transcribe_streaming(samples, sample_rate, online_recognizer):
+    """Décodage par blocs avec le recognizer streaming (mémoire constante)"""
+    import numpy as np
+
+    stream = online_recognizer.create_stream()
+    for offset in range(0, len(samples), STREAM_CHUNK_SAMPLES):
+        stream.accept_waveform(sample_rate, samples[offset:offset + STREAM_CHUNK_SAMPLES])
+        while online_recognizer.is_ready(stream):
+            online_recognizer.decode_stream(stream)
+
+    # Padding de fin pour vider le contexte droit de l'encodeur
+    stream.accept_waveform(sample_rate, np.zeros(int(0.66 * sample_rate), dtype=np.float32))
+    stream.input_finished()
+    while online_recognizer.is_ready(stream):
+        online_recognizer.decode_stream(stream)
+    return online_recognizer.get_result(stream)
+
+
+def transcribe_whole_file(audio_file, recognizer, online_recognizer=None):
     """Transcription sans VAD (fallback)"""
-    samples, sample_rate = sf.read(audio_file, dtype='float32')
-    
-    recognizer = sherpa_onnx.OfflineRecognizer.from_transducer(
-        encoder=os.path.join(model_dir, 'encoder.int8.onnx'),
-        decoder=os.path.join(model_dir, 'decoder.int8.onnx'),
-        joiner=os.path.join(model_dir, 'joiner.int8.onnx'),
-        tokens=os.path.join(model_dir, 'tokens.txt'),
-        num_threads=4,
-        sample_rate=16000,
-        feature_dim=128,
-        model_type='nemo_transducer'
-    )
+    samples, sample_rate = load_audio(audio_file)
+
+    if online_recognizer is not None and len(samples) / sample_rate > ONLINE_MIN_SECONDS:
+        print("Audio long : décodage streaming", file=sys.stderr)
+        return transcribe_streaming(samples, sample_rate, online_recognizer)
     
     stream = recognizer.create_stream()
     stream.accept_waveform(sample_rate, samples)
@@ -178,16 +326,58 @@ def transcribe_whole_file(audio_file, model_dir):
     return stream.result.text
 
 
+def serve(model_dir, provider):
+    """
+    Mode daemon : charge le modèle une fois, puis une requête JSON par ligne
+    Requête : {"audio_path": "..."} -> Réponse : {"success": ..., "text"|"error": ...}
+    """
+    recognizer = load_recognizer(model_dir, provider)
+    vad = load_vad(model_dir)
+    online_recognizer = load_online_recognizer(model_dir, provider) if vad is None else None
+    warm_up(recognizer)
+    print("✓ Daemon prêt", file=sys.stderr)
+    # Signal à l'app : le délai des requêtes ne court qu'à partir d'ici
+    write_json({"ready": True})
+
+    for line in iter(sys.stdin.readline, ''):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            request = json.loads(line)
+            text = transcribe_with_sherpa_chunked(request['audio_path'], recognizer, vad, online_recognizer)
+            result = {"success": True, "text": text}
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+
+        write_json(result)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Transcription avec Parakeet INT8 + VAD chunking")
-    parser.add_argument("audio_file", help="Fichier audio (WAV ou MP3)")
+    parser.add_argument("audio_file", nargs='?', help="Fichier audio (WAV ou MP3)")
     parser.add_argument(
         "--model-dir",
         default=None,
         help="Répertoire du modèle (défaut: ~/Library/Application Support/freesper/models/parakeet-int8)"
     )
+    parser.add_argument(
+        "--provider",
+        choices=["cpu", "coreml"],
+        default=DEFAULT_PROVIDER,
+        help=f"Execution provider ONNX Runtime (défaut: {DEFAULT_PROVIDER})"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Garder le modèle chargé et lire les requêtes JSON sur stdin"
+    )
     args = parser.parse_args()
 
+    if not args.daemon and not args.audio_file:
+        parser.error("audio_file est requis (sauf en mode --daemon)")
+
     # Déterminer le répertoire du modèle
     if args.model_dir:
         model_dir = args.model_dir
@@ -197,16 +387,25 @@ def main():
 
     model_dir = str(model_dir)
 
+    lazy_import()
+
+    if args.daemon:
+        serve(model_dir, args.provider)
+        return
+
     try:
-        # Transcrire avec VAD chunking
-        text = transcribe_with_sherpa_chunked(args.audio_file, model_dir)
+        # Transcrire avec VAD chunking (streaming pour les longs fichiers si pas de VAD)
+        recognizer = load_recognizer(model_dir, args.provider)
+        vad = load_vad(model_dir)
+        online_recognizer = load_online_recognizer(model_dir, args.provider) if vad is None else None
+        text = transcribe_with_sherpa_chunked(args.audio_file, recognizer, vad, online_recognizer)
 
         # Retourner JSON
         result = {
             "success": True,
             "text": text
         }
-        print(json.dumps(result))
+        write_json(result)
 
     except Exception as e:
         # Erreur
@@ -214,7 +413,7 @@ def main():
             "success": False,
             "error": str(e)
         }
-        print(json.dumps(result))
+        write_json(result)
         sys.exit(1)
 
 
@@ -142,7 +142,7 @@ class AutoConverter {
       }
 
       const python = spawn(this.venvPython, ['-c',
-        'import optimum, transformers, torch, librosa, numpy; print("OK")'
+        'import optimum, transformers, torch, numpy; print("OK")'
       ]);
 
       let output = '';
@@ -184,7 +184,7 @@ class AutoConverter {
       });
 
       await this.runPipInstall(['-m', 'pip', 'install',
-        'optimum[onnxruntime]', 'transformers', 'torch', 'librosa', 'numpy'
+        'optimum[onnxruntime]', 'transformers', 'torch', 'numpy'
       ]);
 
       progressCallback({
@@ -254,12 +254,19 @@ class AutoConverter {
         silent: false
       });
 
-      // Use venv's python to run the conversion script
-      const python = spawn(this.venvPython, [
+      const args = [
         scriptPath,
         '--model', modelRepo,
         '--output', outputDir
-      ]);
+      ];
+
+      // CoreML (Apple Silicon) runs FP16 natively: halve the weights
+      if (process.platform === 'darwin' && process.arch === 'arm64') {
+        args.push('--fp16');
+      }
+
+      // Use venv's python to run the conversion script
+      const python = spawn(this.venvPython, args);
 
       let output = '';
       let errorOutput = '';
@@ -1,10 +1,11 @@
 const ort = require('onnxruntime-node');
 const fs = require('fs');
 const path = require('path');
+const os = require('os');
 const { app } = require('electron');
 const wav = require('wav');
-const { spawn } = require('child_process');
 const Tokenizer = require('./tokenizer');
+const PythonWorker = require('./pythonWorker');
 
 // Get FFmpeg path - handle asar unpacked for production
 let ffmpegPath = require('@ffmpeg-installer/ffmpeg').path;
@@ -32,6 +33,247 @@ function getScriptPath(scriptName) {
   }
 }
 
+/**
+ * Decode a feature worker response (JSON header + raw float32 payload)
+ * @param {Object} header - Response header with shape and dtype
+ * @param {Buffer} payload - Raw little-endian float32 data
+ * @returns {{shape: number[], duration: number, data: Float32Array}}
+ */
+function decodeFeatures(header, payload) {
+  if (!header.shape || header.dtype !== 'float32') {
+    throw new Error('Invalid feature header: missing shape or unsupported dtype');
+  }
+
+  const count = header.shape.reduce((a, b) => a * b, 1);
+  const byteLength = count * Float32Array.BYTES_PER_ELEMENT;
+
+  if (!payload || payload.length < byteLength) {
+    throw new Error(`Truncated feature payload: expected ${byteLength} bytes, got ${payload ? payload.length : 0}`);
+  }
+
+  let data;
+  if (payload.byteOffset % Float32Array.BYTES_PER_ELEMENT === 0) {
+    // Zero-copy view over the worker's response buffer
+    data = new Float32Array(payload.buffer, payload.byteOffset, count);
+  } else {
+    data = new Float32Array(count);
+    payload.copy(Buffer.from(data.buffer), 0, 0, byteLength);
+  }
+
+  return { ...header, data };
+}
+
+// Scale for 16-bit PCM -> [-1, 1) float samples
+const INT16_TO_FLOAT = 1 / 32768;
+
+// Parakeet transducer prediction network width (from ONNX inspection)
+const TRANSDUCER_DECODER_DIM = 640;
+
+// Encoder frames scored per joiner call while the decoder output is unchanged
+const JOINER_CHUNK_FRAMES = 16;
+
+// Maximum tokens emitted on a single encoder frame
+const MAX_SYMBOLS_PER_FRAME = 10;
+
+/**
+ * Index of the largest value in data[offset, offset + count)
+ * @param {Float32Array} data - Flat logits
+ * @param {number} offset - Start of the row
+ * @param {number} count - Number of candidates
+ * @returns {number} Index relative to offset
+ */
+function argmaxRange(data, offset, count) {
+  let best = 0;
+  let bestValue = data[offset];
+  for (let v = 1; v < count; v++) {
+    if (data[offset + v] > bestValue) {
+      bestValue = data[offset + v];
+      best = v;
+    }
+  }
+  return best;
+}
+
+/**
+ * Scan a window of frames for the first non-blank greedy prediction
+ * @param {function(number): number} predict - Greedy token for a frame of the window
+ * @param {number} frames - Number of frames in the window
+ * @param {number} blankId - Blank token id
+ * @returns {{frame: number, token: number}} frame === frames if every frame is blank
+ */
+function firstEmission(predict, frames, blankId) {
+  for (let frame = 0; frame < frames; frame++) {
+    const token = predict(frame);
+    if (token !== blankId) {
+      return { frame, token };
+    }
+  }
+  return { frame: frames, token: blankId };
+}
+
+// onnxruntime-node CoreML provider flags (COREML_FLAG_* in coreml_provider_factory.h)
+const COREML_FLAGS = {
+  USE_CPU_ONLY: 0x001,
+  ENABLE_ON_SUBGRAPH: 0x002,
+  ONLY_ENABLE_DEVICE_WITH_ANE: 0x004,
+  ONLY_ALLOW_STATIC_INPUT_SHAPES: 0x008,
+  CREATE_MLPROGRAM: 0x010,
+  USE_CPU_AND_GPU: 0x020
+};
+
+// Default intra-op threads, same heuristic as convert_to_onnx.py: Apple Silicon
+// has no SMT, so every core counts; elsewhere assume 2-way SMT and halve the
+// logical count (SMT siblings only add thread-pool contention)
+const HAS_SMT = !(process.platform === 'darwin' && process.arch === 'arm64');
+const DEFAULT_INTRA_OP_THREADS = Math.max(1, HAS_SMT ? Math.floor(os.cpus().length / 2) : os.cpus().length);
+
+// Sherpa daemon startup budget: interpreter, recognizer load, CoreML
+// compilation and warm-up, counted apart from the per-request timeout
+const SHERPA_STARTUP_TIMEOUT_MS = 300000;
+
+// NeMo worker startup budget: torch/NeMo import and the multi-GB Parakeet
+// checkpoint (downloaded on first use), counted apart from the request timeout
+const NEMO_STARTUP_TIMEOUT_MS = 600000;
+
+const GRAPH_OPTIMIZATION_LEVELS = {
+  ORT_DISABLE_ALL: 'disabled',
+  ORT_ENABLE_BASIC: 'basic',
+  ORT_ENABLE_EXTENDED: 'extended',
+  ORT_ENABLE_ALL: 'all'
+};
+
+/**
+ * Translate a provider entry from config.json (Python ORT naming) to onnxruntime-node
+ * @param {string|Array} provider - Name, or [name, options] pair
+ * @returns {string|Object|null} Execution provider, or null if unsupported here
+ */
+function toExecutionProvider(provider) {
+  const [name, options = {}] = Array.isArray(provider) ? provider : [provider];
+
+  if (name === 'CPUExecutionProvider') {
+    return 'cpu';
+  }
+
+  if (name === 'CoreMLExecutionProvider') {
+    if (process.platform !== 'darwin') {
+      return null;
+    }
+
+    let coreMlFlags = 0;
+    if (options.ModelFormat === 'MLProgram') coreMlFlags |= COREML_FLAGS.CREATE_MLPROGRAM;
+    if (options.MLComputeUnits === 'CPUOnly') coreMlFlags |= COREML_FLAGS.USE_CPU_ONLY;
+    if (options.MLComputeUnits === 'CPUAndGPU') coreMlFlags |= COREML_FLAGS.USE_CPU_AND_GPU;
+    if (options.MLComputeUnits === 'CPUAndNeuralEngine') coreMlFlags |= COREML_FLAGS.ONLY_ENABLE_DEVICE_WITH_ANE;
+    if (options.RequireStaticInputShapes) coreMlFlags |= COREML_FLAGS.ONLY_ALLOW_STATIC_INPUT_SHAPES;
+    return { name: 'coreml', coreMlFlags };
+  }
+
+  return null;
+}
+
+/**
+ * Build ONNX Runtime session options, applying hints from config.json when present
+ * @param {Object|null} modelConfig - Parsed config.json (session_options / providers)
+ * @param {Object} overrides - Extra options (e.g. logging)
+ * @returns {Object} onnxruntime-node session options
+ */
+function buildSessionOptions(modelConfig, overrides = {}) {
+  const sessionOptions = {
+    executionProviders: ['coreml', 'cpu'],
+    graphOptimizationLevel: 'all',
+    enableCpuMemArena: true,
+    enableMemPattern: true,
+    executionMode: 'sequential',
+    intraOpNumThreads: DEFAULT_INTRA_OP_THREADS
+  };
+
+  const hints = (modelConfig && modelConfig.session_options) || {};
+  if (hints.intra_op_num_threads > 0) {
+    sessionOptions.intraOpNumThreads = hints.intra_op_num_threads;
+  }
+  if (GRAPH_OPTIMIZATION_LEVELS[hints.graph_optimization_level]) {
+    sessionOptions.graphOptimizationLevel = GRAPH_OPTIMIZATION_LEVELS[hints.graph_optimization_level];
+  }
+
+  if (modelConfig && Array.isArray(modelConfig.providers)) {
+    const providers = modelConfig.providers.map(toExecutionProvider).filter(p => p !== null);
+    if (!providers.includes('cpu')) {
+      providers.push('cpu');
+    }
+    sessionOptions.executionProviders = providers;
+  }
+
+  return { ...sessionOptions, ...overrides };
+}
+
+/**
+ * Read config.json from a model directory
+ * @param {string} modelDir - Model directory
+ * @returns {Object|null} Parsed config, or null if absent
+ */
+function readModelConfig(modelDir) {
+  const configPath = path.join(modelDir, 'config.json');
+  if (!fs.existsSync(configPath)) {
+    return null;
+  }
+  return JSON.parse(fs.readFileSync(configPath, 'utf-8'));
+}
+
+/**
+ * Map the NeMo transducer decoder's graph names to their roles, once per session
+ * Exports name the LSTM state tensors after internal nodes ('states.1',
+ * 'onnx::Slice_3' -> 'states', '162'), so they are identified by position.
+ * @param {ort.InferenceSession} session - Decoder session
+ * @returns {{targets: string, targetLength: string|undefined, stateInputs: string[], output: string, stateOutputs: string[]}}
+ *   targetLength is undefined for the single-token step decoder
+ */
+function resolveDecoderIO(session) {
+  const inputs = session.inputNames;
+  const outputs = session.outputNames;
+
+  const targets = inputs.includes('targets') ? 'targets' : inputs[0];
+  const targetLength = inputs.find(name => name !== targets && name.includes('length'));
+  const output = outputs.includes('outputs') ? 'outputs' : outputs[0];
+
+  return {
+    targets,
+    targetLength,
+    stateInputs: inputs.filter(name => name !== targets && name !== targetLength),
+    output,
+    stateOutputs: outputs.filter(name => name !== output && !name.includes('length'))
+  };
+}
+
+/**
+ * Precompute the text of each transducer token
+ * Special tokens map to '', SentencePiece word starts ('▁') to a leading space.
+ * @param {string[]} tokens - Vocabulary from tokens.txt
+ * @returns {string[]} Text piece per token id
+ */
+function buildDetokTable(tokens) {
+  return tokens.map(token => {
+    if (token === '<blk>' || token === '<blank>' || token === '<unk>') {
+      return '';
+    }
+    return token.startsWith('▁') ? ' ' + token.slice(1) : token;
+  });
+}
+
+/**
+ * Identity of a model on disk: resolved path plus modification time, so a
+ * re-downloaded or re-converted model is not mistaken for the loaded one
+ * @param {string} modelPathOrDir - Model file or directory
+ * @returns {string|null} Key, or null if the path does not exist
+ */
+function modelLoadKey(modelPathOrDir) {
+  try {
+    const stats = fs.statSync(modelPathOrDir);
+    return `${path.resolve(modelPathOrDir)}@${stats.mtimeMs}`;
+  } catch (error) {
+    return null;
+  }
+}
+
 class InferenceEngine {
   constructor() {
     // Single-model properties (legacy support)
@@ -57,6 +299,30 @@ class InferenceEngine {
 
     // Python manager (set by main.js)
     this.pythonManager = null;
+
+    // Persistent feature extraction process (extract_features.py --daemon)
+    this.featureWorker = null;
+
+    // Persistent sherpa-onnx process (transcribe_sherpa_vad.py --daemon)
+    this.sherpaWorker = null;
+
+    // Persistent NeMo process (transcribe_parakeet.py --serve)
+    this.nemoWorker = null;
+
+    // Transducer decode input buffers (see getTransducerBuffers)
+    this.transducerBuffers = null;
+
+    // Decoder input/output names by role (see resolveDecoderIO)
+    this.decoderIO = null;
+
+    // Transducer token id -> text piece (see buildDetokTable)
+    this.detokTable = null;
+
+    // Joiner returns token ids (joiner.argmax.onnx) instead of logits
+    this.joinerArgmax = false;
+
+    // Path + mtime of the loaded model (see loadModel)
+    this.loadedModelKey = null;
   }
 
   /**
@@ -83,7 +349,27 @@ class InferenceEngine {
     return 'python3';
   }
 
+  /**
+   * Load a model, reusing the current sessions when the same unchanged path is already loaded
+   * @param {string} modelPathOrDir - Model file or directory
+   * @returns {Promise<{success: boolean, error?: string}>}
+   */
   async loadModel(modelPathOrDir) {
+    const loadKey = modelLoadKey(modelPathOrDir);
+    if (this.isLoaded && loadKey !== null && loadKey === this.loadedModelKey) {
+      console.log(`✓ Model already loaded: ${modelPathOrDir}`);
+      return { success: true };
+    }
+
+    this.loadedModelKey = null;
+    const result = await this.loadModelFromDisk(modelPathOrDir);
+    if (result.success) {
+      this.loadedModelKey = loadKey;
+    }
+    return result;
+  }
+
+  async loadModelFromDisk(modelPathOrDir) {
     try {
       console.log(`Loading model from: ${modelPathOrDir}`);
 
@@ -172,13 +458,21 @@ class InferenceEngine {
       }
     }
 
+    // A running worker holds the previous model: replace it
+    if (this.sherpaWorker) {
+      this.sherpaWorker.stop();
+      this.sherpaWorker = null;
+    }
+
     this.sherpaScriptPath = scriptPath;
     this.isLoaded = true;
 
+    // Load and warm up the recognizer now rather than on the first transcription
+    this.getSherpaWorker().start();
+
     console.log('✓ Sherpa-ONNX model configured for use via Python subprocess');
     console.log('Model directory:', modelDir);
     console.log('Script path:', scriptPath);
-    console.log('Note: Model will be loaded on first transcription');
 
     return { success: true };
   }
@@ -187,37 +481,42 @@ class InferenceEngine {
     console.log('Detected transducer architecture (Parakeet)');
     this.architecture = 'transducer';
     this.modelDir = modelDir;
+    this.prestartFeatureWorker();
 
     // Check if models are in subdirectory (HuggingFace ONNX models)
     const onnxSubdir = path.join(modelDir, 'onnx');
     const modelsDir = fs.existsSync(onnxSubdir) ? onnxSubdir : modelDir;
 
     const encoderPath = path.join(modelsDir, 'encoder.onnx');
-    const decoderPath = path.join(modelsDir, 'decoder.onnx');
-    const joinerPath = path.join(modelsDir, 'joiner.onnx');
     const tokensPath = path.join(modelDir, 'tokens.txt');
 
-    // Create session options
-    const sessionOptions = {
-      executionProviders: ['coreml', 'cpu'],
-      graphOptimizationLevel: 'all',
-      enableCpuMemArena: true,
-      enableMemPattern: true,
-      executionMode: 'sequential'
-    };
+    // Prefer the single-token decoder with static shapes (specialize_transducer.py)
+    const stepDecoderPath = path.join(modelsDir, 'decoder.step.onnx');
+    const decoderPath = fs.existsSync(stepDecoderPath) ? stepDecoderPath : path.join(modelsDir, 'decoder.onnx');
+
+    // Prefer the joiner with the greedy ArgMax in-graph (specialize_transducer.py)
+    const argmaxJoinerPath = path.join(modelsDir, 'joiner.argmax.onnx');
+    this.joinerArgmax = fs.existsSync(argmaxJoinerPath);
+    const joinerPath = this.joinerArgmax ? argmaxJoinerPath : path.join(modelsDir, 'joiner.onnx');
+
+    // Load config (session hints written by convert_to_onnx.py)
+    this.modelConfig = readModelConfig(modelDir);
+    const sessionOptions = buildSessionOptions(this.modelConfig);
 
     console.log('Loading transducer encoder...');
     this.encoderSession = await ort.InferenceSession.create(encoderPath, sessionOptions);
     console.log('✓ Encoder loaded');
 
-    console.log('Loading transducer decoder...');
+    console.log(`Loading transducer decoder (${path.basename(decoderPath)})...`);
     this.decoderSession = await ort.InferenceSession.create(decoderPath, sessionOptions);
     console.log('✓ Decoder loaded');
 
-    console.log('Loading transducer joiner...');
+    console.log(`Loading transducer joiner (${path.basename(joinerPath)})...`);
     this.joinerSession = await ort.InferenceSession.create(joinerPath, sessionOptions);
     console.log('✓ Joiner loaded');
 
+    this.decoderIO = resolveDecoderIO(this.decoderSession);
+
     // Load tokens
     if (fs.existsSync(tokensPath)) {
       const tokensContent = fs.readFileSync(tokensPath, 'utf-8');
@@ -227,13 +526,9 @@ class InferenceEngine {
       }).filter(t => t);
       console.log(`✓ Loaded ${this.tokens.length} tokens`);
     }
+    this.detokTable = this.tokens ? buildDetokTable(this.tokens) : null;
 
-    // Load config
-    const configPath = path.join(modelDir, 'config.json');
-    if (fs.existsSync(configPath)) {
-      this.modelConfig = JSON.parse(fs.readFileSync(configPath, 'utf-8'));
-    }
-
+    this.transducerBuffers = null;
     this.isLoaded = true;
     console.log('Transducer model loaded successfully');
     return { success: true };
@@ -243,23 +538,25 @@ class InferenceEngine {
     console.log('Detected multi-model Whisper architecture');
     this.architecture = 'whisper-multi-model';
     this.modelDir = modelDir;
+    this.prestartFeatureWorker();
 
-    const encoderPath = path.join(modelDir, 'encoder_model.onnx');
     const decoderPath = path.join(modelDir, 'decoder_model.onnx');
     const decoderWithPastPath = path.join(modelDir, 'decoder_with_past_model.onnx');
 
-    // Create session options with CoreML/CPU fallback
-    const sessionOptions = {
-      executionProviders: ['coreml', 'cpu'],
-      graphOptimizationLevel: 'all',
-      enableCpuMemArena: true,
-      enableMemPattern: true,
-      executionMode: 'sequential',
+    // Prefer the encoder specialized for [1, 80, 3000]: features are always padded to 30 s
+    const staticEncoderPath = path.join(modelDir, 'encoder_model.static.onnx');
+    const encoderPath = fs.existsSync(staticEncoderPath)
+      ? staticEncoderPath
+      : path.join(modelDir, 'encoder_model.onnx');
+
+    // Load model configuration (session hints), then create sessions with CoreML/CPU fallback
+    this.modelConfig = readModelConfig(modelDir);
+    const sessionOptions = buildSessionOptions(this.modelConfig, {
       logSeverityLevel: 0,
       logVerbosityLevel: 0
-    };
+    });
 
-    console.log('Loading encoder model...');
+    console.log(`Loading encoder model (${path.basename(encoderPath)})...`);
     this.encoderSession = await ort.InferenceSession.create(encoderPath, sessionOptions);
     console.log('✓ Encoder loaded:', this.encoderSession.executionProviders);
 
@@ -271,12 +568,6 @@ class InferenceEngine {
     this.decoderWithPastSession = await ort.InferenceSession.create(decoderWithPastPath, sessionOptions);
     console.log('✓ Decoder with past loaded:', this.decoderWithPastSession.executionProviders);
 
-    // Load model configuration
-    const configPath = path.join(modelDir, 'config.json');
-    if (fs.existsSync(configPath)) {
-      this.modelConfig = JSON.parse(fs.readFileSync(configPath, 'utf-8'));
-    }
-
     // Load tokenizer
     try {
       this.tokenizer = new Tokenizer(modelDir);
@@ -295,23 +586,16 @@ class InferenceEngine {
     console.log('Loading single-model architecture');
     this.architecture = 'single-model';
     this.modelPath = modelPath;
+    this.prestartFeatureWorker();
 
     // Load model configuration
-    const configPath = path.join(path.dirname(modelPath), 'config.json');
-    if (fs.existsSync(configPath)) {
-      this.modelConfig = JSON.parse(fs.readFileSync(configPath, 'utf-8'));
-    }
+    this.modelConfig = readModelConfig(path.dirname(modelPath));
 
     // Create ONNX Runtime session with optimizations
-    const sessionOptions = {
-      executionProviders: ['coreml', 'cpu'],
-      graphOptimizationLevel: 'all',
-      enableCpuMemArena: true,
-      enableMemPattern: true,
-      executionMode: 'sequential',
+    const sessionOptions = buildSessionOptions(this.modelConfig, {
       logSeverityLevel: 0,
       logVerbosityLevel: 0
-    };
+    });
 
     this.session = await ort.InferenceSession.create(modelPath, sessionOptions);
     this.isLoaded = true;
@@ -343,6 +627,12 @@ class InferenceEngine {
       throw new Error(`Script transcribe_parakeet.py not found at: ${scriptPath}`);
     }
     
+    // A running worker holds the previous model: restart it lazily
+    if (this.nemoWorker) {
+      this.nemoWorker.stop();
+      this.nemoWorker = null;
+    }
+
     this.nemoScriptPath = scriptPath;
     this.isLoaded = true;
     
@@ -445,151 +735,68 @@ class InferenceEngine {
     }
   }
 
-  async transcribeSherpaOnnx(audioFilePath) {
-    return new Promise((resolve, reject) => {
-      const overallStart = Date.now();
-
-      console.log('Transcribing with Sherpa-ONNX/Parakeet INT8 via Python subprocess...');
-      console.log('Audio file:', audioFilePath);
-
+  /**
+   * Get (and lazily create) the persistent sherpa-onnx worker
+   * The recognizer and VAD stay loaded between transcriptions. Startup
+   * (recognizer load, CoreML compile, warm-up) is bounded separately from
+   * the per-request timeout.
+   * @returns {PythonWorker}
+   */
+  getSherpaWorker() {
+    if (!this.sherpaWorker) {
       // Determine working directory
       // In packaged app, use the Resources directory
       // In dev mode, use the project root
-      let workingDir;
-      if (app.isPackaged) {
-        workingDir = process.resourcesPath;
-      } else {
-        workingDir = path.join(__dirname, '../..');
-      }
-      
-      console.log('Working directory for Python:', workingDir);
-      console.log('Script path:', this.sherpaScriptPath);
+      const workingDir = app.isPackaged ? process.resourcesPath : path.join(__dirname, '../..');
+      const scriptArgs = [this.sherpaScriptPath, '--daemon', '--model-dir', this.modelDir];
+      const options = { cwd: workingDir, waitForReady: true, readyTimeoutMs: SHERPA_STARTUP_TIMEOUT_MS };
 
-      // Determine Python command
       // In packaged app, use embedded Python from pythonManager
       // In dev mode, use uv run python
-      let pythonCmd;
-      let args;
-
-      if (app.isPackaged) {
-        // In packaged app, use embedded Python
-        pythonCmd = this.getPythonExecutable();
-        console.log('Using embedded Python:', pythonCmd);
-
-        args = [
-          this.sherpaScriptPath,
-          audioFilePath,
-          '--model-dir',
-          this.modelDir
-        ];
-      } else {
-        // In dev mode, use uv run python
-        pythonCmd = 'uv';
-        args = [
-          'run',
-          'python',
-          this.sherpaScriptPath,
-          audioFilePath,
-          '--model-dir',
-          this.modelDir
-        ];
-      }
-
-      console.log('Python command:', pythonCmd, args.join(' '));
-
-      const subprocess = spawn(pythonCmd, args, {
-        cwd: workingDir
-      });
-
-      let stdout = '';
-      let stderr = '';
-      let timeoutId = null;
-      let isResolved = false;
-
-      // Manual timeout implementation
-      timeoutId = setTimeout(() => {
-        if (!isResolved) {
-          console.error('⏱️  Python subprocess timeout (60s), killing process');
-          subprocess.kill('SIGKILL');
-          reject(new Error('Transcription timeout (60 seconds)'));
-          isResolved = true;
-        }
-      }, 60000);
-
-      subprocess.stdout.on('data', (data) => {
-        stdout += data.toString();
-      });
-
-      subprocess.stderr.on('data', (data) => {
-        stderr += data.toString();
-      });
+      this.sherpaWorker = app.isPackaged
+        ? new PythonWorker('sherpa', this.getPythonExecutable(), scriptArgs, options)
+        : new PythonWorker('sherpa', 'uv', ['run', 'python', ...scriptArgs], options);
+    }
 
-      subprocess.on('error', (error) => {
-        if (timeoutId) clearTimeout(timeoutId);
-        if (!isResolved) {
-          console.error('Failed to start Python subprocess:', error);
-          reject(new Error(`Subprocess error: ${error.message}`));
-          isResolved = true;
-        }
-      });
+    return this.sherpaWorker;
+  }
 
-      subprocess.on('close', (code) => {
-        if (timeoutId) clearTimeout(timeoutId);
-        if (isResolved) return; // Already handled by timeout
-        const overallTime = Date.now() - overallStart;
-        isResolved = true;
+  async transcribeSherpaOnnx(audioFilePath) {
+    const overallStart = Date.now();
 
-        if (code !== 0) {
-          console.error('Python script failed with code:', code);
-          console.error('STDERR:', stderr);
-          console.error('STDOUT:', stdout);
-
-          // Try to parse JSON error from stdout
-          try {
-            const lines = stdout.trim().split('\n');
-            const jsonLine = lines[lines.length - 1];
-            const result = JSON.parse(jsonLine);
-            if (result.error) {
-              reject(new Error(result.error));
-              return;
-            }
-          } catch (e) {
-            // Could not parse JSON, use generic error
-          }
+    console.log('Transcribing with Sherpa-ONNX/Parakeet INT8 via Python worker...');
+    console.log('Audio file:', audioFilePath);
 
-          reject(new Error(`Transcription failed (exit code ${code})`));
-          return;
-        }
+    let response;
+    try {
+      response = await this.getSherpaWorker().request({ audio_path: audioFilePath }, 60000);
+    } catch (error) {
+      console.error('Sherpa-ONNX worker failed:', error.message);
+      if (error.message.includes('startup timeout')) {
+        throw new Error(`Model loading timeout (${SHERPA_STARTUP_TIMEOUT_MS / 1000} seconds)`);
+      }
+      if (error.message.includes('timeout')) {
+        throw new Error('Transcription timeout (60 seconds)');
+      }
+      throw new Error(`Subprocess error: ${error.message}`);
+    }
 
-        try {
-          // Parse JSON from stdout (dernière ligne contenant le JSON)
-          const lines = stdout.trim().split('\n');
-          const jsonLine = lines[lines.length - 1];
-          const result = JSON.parse(jsonLine);
-
-          if (!result.success) {
-            console.error('Transcription error:', result.error);
-            reject(new Error(result.error || 'Transcription failed'));
-            return;
-          }
+    const result = response.header;
+    if (!result.success) {
+      console.error('Transcription error:', result.error);
+      throw new Error(result.error || 'Transcription failed');
+    }
 
-          console.log(`✓ Sherpa-ONNX transcription completed in ${overallTime}ms`);
-          console.log('Transcription:', result.text);
+    const overallTime = Date.now() - overallStart;
+    console.log(`✓ Sherpa-ONNX transcription completed in ${overallTime}ms`);
+    console.log('Transcription:', result.text);
 
-          resolve({
-            text: result.text,
-            timing: {
-              total: overallTime
-            }
-          });
-        } catch (error) {
-          console.error('Failed to parse Python output:', error);
-          console.error('STDOUT:', stdout);
-          console.error('STDERR:', stderr);
-          reject(new Error(`Failed to parse transcription result: ${error.message}`));
-        }
-      });
-    });
+    return {
+      text: result.text,
+      timing: {
+        total: overallTime
+      }
+    };
   }
 
   async transcribeTransducer(audioFilePath) {
@@ -648,76 +855,198 @@ class InferenceEngine {
 
   async extractFeaturesForTransducer(audioFilePath) {
     // Parakeet expects 128-dim mel filterbank features
-    // We'll use a modified Python script for this
-    const { spawn } = require('child_process');
-    const { app } = require('electron');
+    // Security: validate that audioFilePath is within the app's temp directory
+    const tempDir = path.join(app.getPath('userData'), 'temp');
+    const resolvedPath = path.resolve(audioFilePath);
+    const resolvedTempDir = path.resolve(tempDir);
 
-    return new Promise((resolve, reject) => {
-      // Security: validate that audioFilePath is within the app's temp directory
-      const tempDir = path.join(app.getPath('userData'), 'temp');
-      const resolvedPath = path.resolve(audioFilePath);
-      const resolvedTempDir = path.resolve(tempDir);
+    if (!resolvedPath.startsWith(resolvedTempDir)) {
+      throw new Error('Security: audio file path outside temp directory');
+    }
 
-      if (!resolvedPath.startsWith(resolvedTempDir)) {
-        return reject(new Error('Security: audio file path outside temp directory'));
-      }
+    if (!fs.existsSync(audioFilePath)) {
+      throw new Error(`Audio file not found: ${audioFilePath}`);
+    }
 
-      if (!fs.existsSync(audioFilePath)) {
-        return reject(new Error(`Audio file not found: ${audioFilePath}`));
-      }
+    const result = await this.requestFeatures(audioFilePath, 128);
+    const [n_mels, time_steps] = result.shape;
 
+    // Parakeet expects [batch, n_mels, time]
+    return {
+      data: result.data,
+      dims: [1, n_mels, time_steps]
+    };
+  }
+
+  /**
+   * Get (and lazily create) the persistent feature extraction worker
+   * @returns {PythonWorker}
+   */
+  getFeatureWorker() {
+    if (!this.featureWorker) {
       const scriptPath = getScriptPath('extract_features.py');
 
       if (!fs.existsSync(scriptPath)) {
-        return reject(new Error(`Feature extraction script not found: ${scriptPath}`));
+        throw new Error(`Feature extraction script not found: ${scriptPath}`);
       }
 
       // Get Python executable from manager (or fallback to system python3)
-      const pythonExecutable = this.getPythonExecutable();
+      this.featureWorker = new PythonWorker(
+        'features',
+        this.getPythonExecutable(),
+        [scriptPath, '--daemon']
+      );
+    }
 
-      // Pass --n_mels 128 for Parakeet
-      const python = spawn(pythonExecutable, [scriptPath, audioFilePath, '--n_mels', '128']);
-      let stdout = '';
-      let stderr = '';
+    return this.featureWorker;
+  }
 
-      python.stdout.on('data', (data) => {
-        stdout += data.toString();
-      });
+  /**
+   * Spawn the feature worker while ONNX sessions load, so interpreter
+   * startup, torch import and filterbank construction overlap with model
+   * loading instead of delaying the first transcription
+   */
+  prestartFeatureWorker() {
+    try {
+      this.getFeatureWorker().start();
+    } catch (error) {
+      // Reported again (with setup hints) on the first feature request
+      console.warn('Feature worker not started:', error.message);
+    }
+  }
 
-      python.stderr.on('data', (data) => {
-        stderr += data.toString();
-      });
+  /**
+   * Extract log-mel features through the feature worker
+   * @param {string} audioFilePath - Path to audio file
+   * @param {number} nMels - Number of mel filterbanks
+   * @returns {Promise<{shape: number[], duration: number, data: Float32Array}>}
+   */
+  async requestFeatures(audioFilePath, nMels) {
+    let response;
+    try {
+      response = await this.getFeatureWorker().request({
+        audio_path: audioFilePath,
+        n_mels: nMels
+      }, 60000);
+    } catch (error) {
+      if (error.code === 'ENOENT') {
+        throw new Error(
+          'Python 3 not found. Please install Python 3.9+ and ensure it is in your PATH'
+        );
+      }
+      throw new Error(`Feature extraction failed: ${error.message}`);
+    }
 
-      python.on('close', (code) => {
-        if (code !== 0) {
-          console.error('Python stderr:', stderr);
-          return reject(new Error(`Feature extraction failed: ${stderr}`));
-        }
+    const { header, payload } = response;
 
-        try {
-          const result = JSON.parse(stdout);
-          if (result.error) {
-            return reject(new Error(result.error));
-          }
+    if (header.error) {
+      // Missing modules: the worker exits after reporting, so prompt for setup
+      if (header.error.endsWith('not installed')) {
+        throw new Error(
+          'Python dependencies not installed. Please restart the app to trigger automatic setup.'
+        );
+      }
+      throw new Error(`Feature extraction error: ${header.error}`);
+    }
 
-          const [n_mels, time_steps] = result.shape;
-          const featuresFlat = new Float32Array(result.features.flat());
+    return decodeFeatures(header, payload);
+  }
 
-          // Parakeet expects [batch, n_mels, time]
-          resolve({
-            data: featuresFlat,
-            dims: [1, n_mels, time_steps]
-          });
+  /**
+   * Run the transducer prediction network on one token
+   * @param {number} token - Previous emitted token (blank at start)
+   * @param {{state1: Float32Array, state2: Float32Array}} state - LSTM states before the token
+   * @returns {Promise<{output: Float32Array, state: Object}>} Decoder output and updated states
+   */
+  async runTransducerDecoder(token, state) {
+    const decoderDim = TRANSDUCER_DECODER_DIM;
+    const buffers = this.getTransducerBuffers();
 
-        } catch (parseError) {
-          return reject(new Error(`Failed to parse features: ${parseError.message}`));
-        }
-      });
+    // Reused single-token input: only the token id changes between calls
+    buffers.targets[0] = token;
 
-      python.on('error', (error) => {
-        return reject(new Error(`Failed to spawn Python: ${error.message}`));
-      });
+    const io = this.decoderIO;
+
+    const feeds = {
+      [io.targets]: buffers.targetsTensor,
+      [io.stateInputs[0]]: new ort.Tensor('float32', state.state1, [2, 1, decoderDim]),
+      [io.stateInputs[1]]: new ort.Tensor('float32', state.state2, [2, 1, decoderDim])
+    };
+    // The single-token step decoder has target_length folded into the graph
+    if (io.targetLength) {
+      feeds[io.targetLength] = buffers.targetLengthTensor;
+    }
+
+    const decoderOutputs = await this.decoderSession.run(feeds);
+
+    const newState1 = decoderOutputs[io.stateOutputs[0]];
+    const newState2 = decoderOutputs[io.stateOutputs[1]];
+
+    // Output tensors own fresh buffers on every run: use them without copying
+    return {
+      output: decoderOutputs[io.output].data,  // [batch, 640, 1]
+      state: {
+        state1: newState1 ? newState1.data : state.state1,
+        state2: newState2 ? newState2.data : state.state2
+      }
+    };
+  }
+
+  /**
+   * Input buffers reused across decoder/joiner calls (allocated once per model)
+   * @returns {{targets: Int32Array, targetsTensor: ort.Tensor, targetLengthTensor: ort.Tensor, encoderWindow: Float32Array|null}}
+   */
+  getTransducerBuffers() {
+    if (!this.transducerBuffers) {
+      // Parakeet expects int32 targets, not int64
+      const targets = new Int32Array(1);
+      this.transducerBuffers = {
+        targets,
+        targetsTensor: new ort.Tensor('int32', targets, [1, 1]),
+        targetLengthTensor: new ort.Tensor('int32', Int32Array.from([1]), [1]),
+        encoderWindow: null
+      };
+    }
+    return this.transducerBuffers;
+  }
+
+  /**
+   * Run the joiner on `count` consecutive encoder frames against one decoder output
+   * @param {{data: Float32Array, frames: Float32Array, dim: number, T: number}} encoder - Encoder
+   *   output [1, encoder_dim, T] plus its time-major [T, encoder_dim] copy
+   * @param {number} start - First frame
+   * @param {number} count - Number of frames
+   * @param {Float32Array} decoderOutput - Decoder output [640]
+   * @returns {Promise<ort.Tensor>} Logits [1, count, 1, vocab_size], or int64 token ids
+   *   [1, count, 1] with the ArgMax joiner
+   */
+  async runTransducerJoiner(encoder, start, count, decoderOutput) {
+    const encoderDim = encoder.dim;
+    const T = encoder.T;
+
+    let encoderWindow;
+    if (count === 1) {
+      // A single frame is contiguous in the time-major copy: [1, encoder_dim, 1] view, no copy
+      encoderWindow = encoder.frames.subarray(start * encoderDim, (start + 1) * encoderDim);
+    } else {
+      // [1, encoder_dim, T] -> [1, encoder_dim, count] window, in a buffer sized for the largest window
+      const buffers = this.getTransducerBuffers();
+      if (!buffers.encoderWindow || buffers.encoderWindow.length !== encoderDim * JOINER_CHUNK_FRAMES) {
+        buffers.encoderWindow = new Float32Array(encoderDim * JOINER_CHUNK_FRAMES);
+      }
+      encoderWindow = buffers.encoderWindow.subarray(0, encoderDim * count);
+      for (let d = 0; d < encoderDim; d++) {
+        const row = encoder.data.subarray(d * T + start, d * T + start + count);
+        encoderWindow.set(row, d * count);
+      }
+    }
+
+    // The joint broadcasts encoder frames against the single decoder step
+    const joinerOutputs = await this.joinerSession.run({
+      'encoder_outputs': new ort.Tensor('float32', encoderWindow, [1, encoderDim, count]),
+      'decoder_outputs': new ort.Tensor('float32', decoderOutput, [1, TRANSDUCER_DECODER_DIM, 1])
     });
+    return joinerOutputs[this.joinerSession.outputNames[0]];
   }
 
   async greedyTransducerDecode(encoderOut, encodedLengths) {
@@ -731,139 +1060,80 @@ class InferenceEngine {
     console.log(`Using blank token ID: ${blankId}, vocab size: ${this.tokens?.length || 'unknown'}`);
     
     // Encoder output shape from Parakeet: [batch, encoder_dim, T] = [1, 1024, T]
-    const batch = encoderOut.dims[0];  // 1
-    const encoderDim = encoderOut.dims[1];  // 1024
+    const encoderDim = encoderOut.dims[1];
     const T = encoderOut.dims[2];  // Time dimension (after subsampling)
-    const decoderDim = 640;  // From ONNX inspection
+
+    // Transpose once to time-major so per-frame joiner steps can use views
+    const frames = new Float32Array(T * encoderDim);
+    for (let d = 0; d < encoderDim; d++) {
+      const row = d * T;
+      for (let t = 0; t < T; t++) {
+        frames[t * encoderDim + d] = encoderOut.data[row + t];
+      }
+    }
+    const encoder = { data: encoderOut.data, frames, dim: encoderDim, T };
     
     console.log(`Decoding ${T} encoder frames...`);
     
     // Initialize decoder state (LSTM states)
     // states.1: [2, batch, 640] - hidden states for 2 LSTM layers
     // onnx::Slice_3: [2, 1, 640] - cell states
-    let decoderState1 = new Float32Array(2 * 1 * decoderDim).fill(0);
-    let decoderState2 = new Float32Array(2 * 1 * decoderDim).fill(0);
-    
-    // Start with blank token
-    let prevToken = blankId;
-    
-    for (let t = 0; t < T && tokenIds.length < maxSteps; t++) {
-      // Get encoder output for current time step
-      // Data layout: [batch, encoder_dim, T] -> index = d * T + t for each dimension d
-      const encoderSlice = new Float32Array(encoderDim);
-      for (let d = 0; d < encoderDim; d++) {
-        encoderSlice[d] = encoderOut.data[d * T + t];
+    let decoder = await this.runTransducerDecoder(blankId, {
+      state1: new Float32Array(2 * TRANSDUCER_DECODER_DIM),
+      state2: new Float32Array(2 * TRANSDUCER_DECODER_DIM)
+    });
+
+    // IMPORTANT: The joiner vocab (8198) is larger than decoder vocab (8193)
+    // We must constrain our search to valid decoder token range
+    // (the ArgMax joiner already slices to it in-graph)
+    const decoderVocabSize = this.tokens ? this.tokens.length : 8193;
+    let vocabSize = 0;
+    let maxValidToken = 0;
+
+    // Greedy prediction for one frame of a joiner output
+    const predict = this.joinerArgmax
+      ? (output, frame) => Number(output.data[frame])
+      : (output, frame) => argmaxRange(output.data, frame * vocabSize, maxValidToken);
+
+    let t = 0;
+    let nextProgress = 50;
+    while (t < T && tokenIds.length < maxSteps) {
+      // The decoder output only changes on emissions: score a whole window of
+      // frames in one joiner call and jump to the first non-blank one
+      const count = Math.min(JOINER_CHUNK_FRAMES, T - t);
+      const logits = await this.runTransducerJoiner(encoder, t, count, decoder.output);  // [1, count, 1, vocab_size]
+
+      if (vocabSize === 0 && !this.joinerArgmax) {
+        vocabSize = logits.dims[logits.dims.length - 1];
+        maxValidToken = Math.min(vocabSize, decoderVocabSize);
+        console.log(`Joiner output shape: [${logits.dims.join(', ')}]`);
+        console.log(`Joiner vocab size: ${vocabSize}, Decoder vocab size: ${decoderVocabSize}`);
+        console.log(`Searching tokens 0-${maxValidToken - 1} (blank at ${blankId})`);
       }
-      
-      let emittedThisFrame = false;
-      let innerSteps = 0;
-      
-      // Inner loop: emit tokens until blank
-      while (!emittedThisFrame && innerSteps < 10) {
-        innerSteps++;
-        
-        // Run decoder with previous token (Parakeet expects int32, not int64)
-        const targetsTensor = new ort.Tensor('int32', Int32Array.from([prevToken]), [1, 1]);
-        const targetLengthTensor = new ort.Tensor('int32', Int32Array.from([1]), [1]);
-        const state1Tensor = new ort.Tensor('float32', decoderState1, [2, 1, decoderDim]);
-        const state2Tensor = new ort.Tensor('float32', decoderState2, [2, 1, decoderDim]);
-        
-        const decoderFeeds = {
-          'targets': targetsTensor,
-          'target_length': targetLengthTensor,
-          'states.1': state1Tensor,
-          'onnx::Slice_3': state2Tensor
-        };
-        
-        const decoderOutputs = await this.decoderSession.run(decoderFeeds);
-        const decoderOut = decoderOutputs['outputs'];  // [batch, 640, 1]
-        
-        // Get new decoder states (but don't update yet - wait for decision)
-        const newState1 = decoderOutputs['states'];
-        const newState2 = decoderOutputs['162'];
-        
-        // Run joiner
-        // encoder_outputs: [batch, 1024, 1], decoder_outputs: [batch, 640, 1]
-        const joinerFeeds = {
-          'encoder_outputs': new ort.Tensor('float32', encoderSlice, [1, encoderDim, 1]),
-          'decoder_outputs': new ort.Tensor('float32', new Float32Array(decoderOut.data), [1, decoderDim, 1])
-        };
-        
-        const joinerOutputs = await this.joinerSession.run(joinerFeeds);
-        const logits = joinerOutputs['outputs'];  // [1, 1, 1, vocab_size]
-        
-        // Greedy: argmax over vocabulary
-        const vocabSize = logits.dims[logits.dims.length - 1];
-        
-        // IMPORTANT: The joiner vocab (8198) is larger than decoder vocab (8193)
-        // We must constrain our search to valid decoder token range
-        const decoderVocabSize = this.tokens ? this.tokens.length : 8193;
-        const maxValidToken = Math.min(vocabSize, decoderVocabSize);
-        
-        let maxLogit = -Infinity;
-        let bestToken = blankId;
-        
-        // Debug: log joiner output shape and vocab size on first iteration
-        if (t === 0 && innerSteps === 1) {
-          console.log(`Joiner output shape: [${logits.dims.join(', ')}]`);
-          console.log(`Joiner vocab size: ${vocabSize}, Decoder vocab size: ${decoderVocabSize}`);
-          console.log(`Searching tokens 0-${maxValidToken - 1} (blank at ${blankId})`);
-          
-          // Debug: show top 5 logits
-          const logitArray = Array.from(logits.data).slice(0, maxValidToken);
-          const indexed = logitArray.map((val, idx) => ({ idx, val }));
-          indexed.sort((a, b) => b.val - a.val);
-          console.log('Top 5 logits:', indexed.slice(0, 5).map(x => `${x.idx}(${this.tokens?.[x.idx] || '?'})=${x.val.toFixed(3)}`).join(', '));
-          console.log('Blank logit:', logits.data[blankId]?.toFixed(3));
-        }
-        
-        // No blank penalty - let model use natural blank/non-blank balance
-        // Works best for English. Multilingual may need different approach.
-        const adjustedLogits = new Float32Array(logits.data);
-
-        // Only search within valid decoder token range
-        for (let v = 0; v < maxValidToken; v++) {
-          if (adjustedLogits[v] > maxLogit) {
-            maxLogit = adjustedLogits[v];
-            bestToken = v;
-          }
-        }
-        
-        // Debug: log generated token (only first few frames and non-blank emissions)
-        if ((t < 5 || (t < 20 && bestToken !== blankId)) && innerSteps === 1) {
-          // Show top 10 logits for debugging
-          const logitArray = Array.from(logits.data).slice(0, maxValidToken);
-          const indexed = logitArray.map((val, idx) => ({ idx, val }));
-          indexed.sort((a, b) => b.val - a.val);
-          console.log(`\nFrame ${t}: Top 10 logits:`, indexed.slice(0, 10).map(x => `${x.idx}(${this.tokens?.[x.idx] || '?'})=${x.val.toFixed(3)}`).join(', '));
-          console.log(`Frame ${t}: Selected token ${bestToken} (${this.tokens?.[bestToken] || '?'}), logit: ${logits.data[bestToken]?.toFixed(3)}`);
-        }
-        
-        if (bestToken === blankId) {
-          // Blank token - move to next encoder frame
-          // Update states from this decoder run (we processed prevToken)
-          if (newState1) decoderState1 = new Float32Array(newState1.data);
-          if (newState2) decoderState2 = new Float32Array(newState2.data);
-          emittedThisFrame = true;
-        } else {
-          // Non-blank token - emit and update state
-          tokenIds.push(bestToken);
-          
-          // Update states from this decoder run
-          if (newState1) decoderState1 = new Float32Array(newState1.data);
-          if (newState2) decoderState2 = new Float32Array(newState2.data);
-          
-          // Update prevToken for next iteration
-          prevToken = bestToken;
-          
-          // Continue inner loop with the same encoder frame
-          // The next decoder call will use bestToken as input
-        }
+
+      let { frame, token } = firstEmission(frame => predict(logits, frame), count, blankId);
+
+      t += frame;
+      if (frame === count) {
+        continue;  // Only blanks in this window
       }
-      
+
+      // Non-blank: emit, advance the decoder, and keep scoring this frame step by step
+      let symbols = 0;
+      while (token !== blankId && symbols < MAX_SYMBOLS_PER_FRAME && tokenIds.length < maxSteps) {
+        tokenIds.push(token);
+        symbols++;
+
+        decoder = await this.runTransducerDecoder(token, decoder.state);
+        const stepLogits = await this.runTransducerJoiner(encoder, t, 1, decoder.output);
+        token = predict(stepLogits, 0);
+      }
+      t++;
+
       // Progress logging
-      if (t > 0 && t % 50 === 0) {
+      if (t >= nextProgress) {
         console.log(`  Processed ${t}/${T} frames, ${tokenIds.length} tokens`);
+        nextProgress += 50;
       }
     }
     
@@ -879,99 +1149,77 @@ class InferenceEngine {
     console.log('Token IDs to decode:', tokenIds);
     console.log('First 10 token strings:', tokenIds.slice(0, 10).map(id => `${id}:${this.tokens[id]}`));
 
-    let text = '';
+    if (!this.detokTable) {
+      this.detokTable = buildDetokTable(this.tokens);
+    }
+
+    const table = this.detokTable;
+    const pieces = [];
     for (const id of tokenIds) {
-      if (id >= 0 && id < this.tokens.length) {
-        let token = this.tokens[id];
+      if (id >= 0 && id < table.length) {
+        pieces.push(table[id]);
+      }
+    }
 
-        // Handle special tokens
-        if (token === '<blk>' || token === '<blank>' || token === '<unk>') {
-          continue;
-        }
+    return pieces.join('').trim();
+  }
 
-        // Handle SentencePiece-style tokens
-        if (token.startsWith('▁')) {
-          text += ' ' + token.slice(1);
-        } else {
-          text += token;
-        }
-      }
+  /**
+   * Get (and lazily create) the persistent NeMo worker
+   * The Parakeet model stays loaded between transcriptions; model loading
+   * is bounded separately from the per-request timeout.
+   * @returns {PythonWorker}
+   */
+  getNeMoWorker() {
+    if (!this.nemoWorker) {
+      const workingDir = app.isPackaged ? process.resourcesPath : path.join(__dirname, '../..');
+      const scriptArgs = [this.nemoScriptPath, '--serve', '--model', this.modelId];
+      const options = { cwd: workingDir, waitForReady: true, readyTimeoutMs: NEMO_STARTUP_TIMEOUT_MS };
+
+      this.nemoWorker = app.isPackaged
+        ? new PythonWorker('nemo', this.getPythonExecutable(), scriptArgs, options)
+        : new PythonWorker('nemo', 'uv', ['run', 'python', ...scriptArgs], options);
     }
 
-    return text.trim();
+    return this.nemoWorker;
   }
 
   async transcribeNeMo(audioFilePath) {
-    return new Promise((resolve, reject) => {
-      const overallStart = Date.now();
-      
-      console.log('Transcribing with NeMo/Parakeet via Python subprocess...');
-      console.log('Audio file:', audioFilePath);
-      
-      // Use uv run to ensure correct Python environment
-      const pythonCmd = 'uv';
-      const args = ['run', 'python', this.nemoScriptPath, audioFilePath];
-      
-      const subprocess = spawn(pythonCmd, args, {
-        cwd: path.join(__dirname, '../..'),
-        timeout: 60000 // 60 second timeout
-      });
-      
-      let stdout = '';
-      let stderr = '';
-      
-      subprocess.stdout.on('data', (data) => {
-        stdout += data.toString();
-      });
-      
-      subprocess.stderr.on('data', (data) => {
-        stderr += data.toString();
-      });
-      
-      subprocess.on('error', (error) => {
-        console.error('Failed to start Python subprocess:', error);
-        reject(new Error(`Subprocess error: ${error.message}`));
-      });
-      
-      subprocess.on('close', (code) => {
-        const overallTime = Date.now() - overallStart;
-        
-        if (code !== 0) {
-          console.error('Python script failed with code:', code);
-          console.error('STDERR:', stderr);
-          reject(new Error(`Transcription failed (exit code ${code})`));
-          return;
-        }
-        
-        try {
-          // Parse JSON from stdout (dernière ligne contenant le JSON)
-          const lines = stdout.trim().split('\n');
-          const jsonLine = lines[lines.length - 1];
-          const result = JSON.parse(jsonLine);
-          
-          if (!result.success) {
-            console.error('Transcription error:', result.error);
-            reject(new Error(result.error || 'Transcription failed'));
-            return;
-          }
-          
-          console.log(`✓ NeMo transcription completed in ${overallTime}ms`);
-          console.log('Transcription:', result.text);
-          
-          resolve({
-            text: result.text,
-            timing: {
-              total: overallTime
-            }
-          });
-        } catch (error) {
-          console.error('Failed to parse Python output:', error);
-          console.error('STDOUT:', stdout);
-          console.error('STDERR:', stderr);
-          reject(new Error(`Failed to parse transcription result: ${error.message}`));
-        }
-      });
-    });
+    const overallStart = Date.now();
+
+    console.log('Transcribing with NeMo/Parakeet via Python worker...');
+    console.log('Audio file:', audioFilePath);
+
+    let response;
+    try {
+      response = await this.getNeMoWorker().request({ audio_path: audioFilePath }, 60000);
+    } catch (error) {
+      console.error('NeMo worker failed:', error.message);
+      if (error.message.includes('startup timeout')) {
+        throw new Error(`Model loading timeout (${NEMO_STARTUP_TIMEOUT_MS / 1000} seconds)`);
+      }
+      if (error.message.includes('timeout')) {
+        throw new Error('Transcription timeout (60 seconds)');
+      }
+      throw new Error(`Subprocess error: ${error.message}`);
+    }
+
+    const result = response.header;
+    if (!result.success) {
+      console.error('Transcription error:', result.error);
+      throw new Error(result.error || 'Transcription failed');
+    }
+
+    const overallTime = Date.now() - overallStart;
+    console.log(`✓ NeMo transcription completed in ${overallTime}ms`);
+    console.log('Transcription:', result.text);
+
+    return {
+      text: result.text,
+      timing: {
+        total: overallTime
+      }
+    };
   }
 
   async transcribeMultiModel(audioFilePath) {
@@ -1165,7 +1413,7 @@ class InferenceEngine {
     try {
       const overallStart = Date.now();
 
-      // Extract features using Python/librosa
+      // Extract features using the Python/torchaudio worker
       const featureStart = Date.now();
       const features = await this.extractFeatures(audioFilePath);
       const featureTime = Date.now() - featureStart;
@@ -1271,10 +1519,21 @@ class InferenceEngine {
 
       reader.on('end', () => {
         const audioBuffer = Buffer.concat(audioChunks);
-        // Convert to Float32Array
-        const samples = new Float32Array(audioBuffer.length / 2);
-        for (let i = 0; i < samples.length; i++) {
-          samples[i] = audioBuffer.readInt16LE(i * 2) / 32768.0;
+        const count = audioBuffer.length >> 1;
+
+        // View the PCM bytes as int16 (little-endian, like every supported host)
+        let pcm;
+        if (audioBuffer.byteOffset % Int16Array.BYTES_PER_ELEMENT === 0) {
+          pcm = new Int16Array(audioBuffer.buffer, audioBuffer.byteOffset, count);
+        } else {
+          pcm = new Int16Array(count);
+          audioBuffer.copy(Buffer.from(pcm.buffer), 0, 0, count * 2);
+        }
+
+        // Convert to Float32Array: one multiply per sample instead of readInt16LE + divide
+        const samples = new Float32Array(count);
+        for (let i = 0; i < count; i++) {
+          samples[i] = pcm[i] * INT16_TO_FLOAT;
         }
         resolve(samples);
       });
@@ -1286,107 +1545,33 @@ class InferenceEngine {
   }
 
   async extractFeatures(audioFilePath) {
-    // Convert audio file to log-mel spectrogram using Python/librosa
-    const { spawn } = require('child_process');
-    const { promisify } = require('util');
+    // Convert audio file to log-mel spectrogram via the Python feature worker
+    console.log('Extracting features from:', audioFilePath);
+    const startTime = Date.now();
 
-    return new Promise((resolve, reject) => {
-      const scriptPath = getScriptPath('extract_features.py');
-
-      // Check if Python script exists
-      if (!fs.existsSync(scriptPath)) {
-        return reject(new Error(`Feature extraction script not found: ${scriptPath}`));
-      }
-
-      console.log('Extracting features from:', audioFilePath);
-      const startTime = Date.now();
-
-      // Get Python executable from manager (or fallback to system python3)
-      const pythonExecutable = this.getPythonExecutable();
-
-      const python = spawn(pythonExecutable, [scriptPath, audioFilePath]);
-      let stdout = '';
-      let stderr = '';
+    const result = await this.requestFeatures(audioFilePath, 80);
 
-      python.stdout.on('data', (data) => {
-        stdout += data.toString();
-      });
+    const extractionTime = Date.now() - startTime;
+    console.log(`Feature extraction completed in ${extractionTime}ms`);
 
-      python.stderr.on('data', (data) => {
-        stderr += data.toString();
-      });
+    // Validate dimensions (should be [n_mels, time_steps])
+    const [n_mels, time_steps] = result.shape;
 
-      python.on('close', (code) => {
-        const extractionTime = Date.now() - startTime;
-        console.log(`Feature extraction completed in ${extractionTime}ms`);
-
-        if (code !== 0) {
-          console.error('Python stderr:', stderr);
-
-          // Provide helpful error messages
-          if (stderr.includes('librosa') || stderr.includes('numpy')) {
-            return reject(new Error(
-              'Python dependencies not installed. Please restart the app to trigger automatic setup.'
-            ));
-          } else if (stderr.includes('ModuleNotFoundError')) {
-            return reject(new Error(
-              'Missing Python modules. Please restart the app to trigger automatic setup.'
-            ));
-          } else {
-            return reject(new Error(`Feature extraction failed (code ${code}): ${stderr}`));
-          }
-        }
-
-        try {
-          // Parse JSON output from Python script
-          const result = JSON.parse(stdout);
-
-          if (result.error) {
-            return reject(new Error(`Feature extraction error: ${result.error}`));
-          }
-
-          // Validate output structure
-          if (!result.features || !result.shape) {
-            return reject(new Error('Invalid feature extraction output: missing features or shape'));
-          }
-
-          // Validate dimensions (should be [n_mels, time_steps])
-          const [n_mels, time_steps] = result.shape;
-
-          if (n_mels !== 80) {
-            return reject(new Error(`Invalid mel bins count: expected 80, got ${n_mels}`));
-          }
-
-          if (time_steps <= 0) {
-            return reject(new Error(`Invalid time steps: ${time_steps}`));
-          }
-
-          console.log(`Feature shape: [${n_mels}, ${time_steps}]`);
-
-          // Convert features to Float32Array for ONNX
-          // Features are returned as flat array, reshape to [1, n_mels, time_steps]
-          const featuresFlat = new Float32Array(result.features.flat());
+    if (n_mels !== 80) {
+      throw new Error(`Invalid mel bins count: expected 80, got ${n_mels}`);
+    }
 
-          resolve({
-            data: featuresFlat,
-            dims: [1, n_mels, time_steps]
-          });
+    if (time_steps <= 0) {
+      throw new Error(`Invalid time steps: ${time_steps}`);
+    }
 
-        } catch (parseError) {
-          console.error('Failed to parse Python output:', stdout);
-          return reject(new Error(`Failed to parse feature extraction output: ${parseError.message}`));
-        }
-      });
+    console.log(`Feature shape: [${n_mels}, ${time_steps}]`);
 
-      python.on('error', (error) => {
-        if (error.code === 'ENOENT') {
-          return reject(new Error(
-            'Python 3 not found. Please install Python 3.9+ and ensure it is in your PATH'
-          ));
-        }
-        return reject(new Error(`Failed to spawn Python process: ${error.message}`));
-      });
-    });
+    // Features are returned as a flat Float32Array, reshape to [1, n_mels, time_steps]
+    return {
+      data: result.data,
+      dims: [1, n_mels, time_steps]
+    };
   }
 
   decodeOutput(results) {
@@ -1457,12 +1642,31 @@ class InferenceEngine {
       this.session = null;
     }
 
+    // Stop the feature extraction worker
+    if (this.featureWorker) {
+      this.featureWorker.stop();
+      this.featureWorker = null;
+    }
+
+    // Stop the sherpa-onnx worker (frees the loaded recognizer)
+    if (this.sherpaWorker) {
+      this.sherpaWorker.stop();
+      this.sherpaWorker = null;
+    }
+
+    // Stop the NeMo worker (frees the loaded Parakeet model)
+    if (this.nemoWorker) {
+      this.nemoWorker.stop();
+      this.nemoWorker = null;
+    }
+
     // Clean up common properties
     if (this.tokenizer) {
       this.tokenizer = null;
     }
 
     this.isLoaded = false;
+    this.loadedModelKey = null;
     this.modelPath = null;
     this.modelDir = null;
     this.architecture = null;
@@ -3,6 +3,8 @@ const path = require('path');
 const https = require('https');
 const { app } = require('electron');
 
+const SILERO_VAD_URL = 'https://github.com/k2-fsa/sherpa-onnx/releases/download/asr-models/silero_vad.onnx';
+
 class ModelManager {
   constructor() {
     this.modelsDir = path.join(app.getPath('userData'), 'models');
@@ -296,6 +298,17 @@ class ModelManager {
       fs.rmSync(tempDir, { recursive: true, force: true });
       fs.unlinkSync(archivePath);
 
+      // Silero VAD as ONNX: run by sherpa-onnx, so transcription doesn't need torch
+      // Optional: the transcription script falls back to torch.hub without it
+      progressCallback && progressCallback(85, 'Downloading VAD model...');
+      const vadPath = path.join(modelDir, 'silero_vad.onnx');
+      try {
+        await execAsync(`curl -fL -o "${vadPath}" "${SILERO_VAD_URL}"`);
+      } catch (vadError) {
+        console.warn('Silero VAD ONNX download failed, torch VAD will be used:', vadError.message);
+        fs.rmSync(vadPath, { force: true });
+      }
+
       // Install Python dependencies required for Sherpa-ONNX
       progressCallback && progressCallback(90, 'Installing Python dependencies...');
       await this.installSherpaOnnxDependencies();
@@ -331,7 +344,7 @@ class ModelManager {
 
   /**
    * Install Python dependencies required for Sherpa-ONNX transcription
-   * This ensures the venv has sherpa-onnx and soundfile installed
+   * This ensures the venv has sherpa-onnx, soundfile and soxr installed
    */
   async installSherpaOnnxDependencies() {
     const { exec } = require('child_process');
@@ -355,8 +368,8 @@ class ModelManager {
       }
     }
 
-    // Install sherpa-onnx and soundfile
-    console.log('Installing sherpa-onnx and soundfile in venv...');
+    // Install sherpa-onnx, soundfile and the soxr resampler
+    console.log('Installing sherpa-onnx, soundfile and soxr in venv...');
     
     try {
       // Upgrade pip first
@@ -365,12 +378,12 @@ class ModelManager {
       });
       
       // Install dependencies
-      const { stdout, stderr } = await execAsync(`"${venvPip}" install sherpa-onnx soundfile torch torchaudio`, {
+      const { stdout, stderr } = await execAsync(`"${venvPip}" install sherpa-onnx soundfile soxr torch torchaudio`, {
         timeout: 180000, // 3 minutes timeout
         maxBuffer: 1024 * 1024 * 10 // 10MB buffer
       });
       
-      console.log('✓ sherpa-onnx, soundfile, torch, and torchaudio installed successfully');
+      console.log('✓ sherpa-onnx, soundfile, soxr, torch, and torchaudio installed successfully');
       if (stdout) console.log('pip stdout:', stdout.slice(-500)); // Last 500 chars
       
       return { success: true };
@@ -3,12 +3,16 @@ const fs = require('fs');
 const path = require('path');
 const { spawn, execSync } = require('child_process');
 
+// Modules checked on startup (light imports only: torch is too slow for the 5 s check).
+// Recorded in the status file, so adding one here re-verifies existing installs.
+const STARTUP_CHECK_MODULES = ['numpy', 'soundfile', 'soxr'];
+
 /**
  * PythonManager - Handles embedded Python runtime and dependency installation
  *
  * Manages:
  * - Detection of bundled Python runtime
- * - First-run dependency installation (librosa, numpy)
+ * - First-run dependency installation (numpy, soundfile, torch, sherpa-onnx)
  * - Python executable path resolution
  */
 class PythonManager {
@@ -55,8 +59,8 @@ class PythonManager {
    * @returns {boolean}
    */
   isDependenciesInstalled() {
-    // Check if status file exists (marks successful installation)
-    if (fs.existsSync(this.statusFile)) {
+    // Status file marks a successful installation, valid for the same module list
+    if (this.readStatusModules() === STARTUP_CHECK_MODULES.join(',')) {
       return true;
     }
 
@@ -67,14 +71,14 @@ class PythonManager {
     }
 
     try {
-      // Test if librosa and numpy are importable
-      execSync(`"${venvPython}" -c "import librosa, numpy"`, {
+      // Test if the audio/feature stack is importable
+      execSync(`"${venvPython}" -c "import ${STARTUP_CHECK_MODULES.join(', ')}"`, {
         stdio: 'ignore',
         timeout: 5000
       });
 
       // Mark as installed for next time
-      fs.writeFileSync(this.statusFile, new Date().toISOString());
+      this.writeStatusFile();
       return true;
     } catch (err) {
       // Log error for debugging (could be timeout, import error, etc.)
@@ -87,6 +91,26 @@ class PythonManager {
     }
   }
 
+  /**
+   * Module list recorded by the last successful check, or null
+   * (status files from older versions hold only a timestamp)
+   * @returns {string|null}
+   */
+  readStatusModules() {
+    try {
+      return JSON.parse(fs.readFileSync(this.statusFile, 'utf-8')).modules.join(',');
+    } catch (err) {
+      return null;
+    }
+  }
+
+  writeStatusFile() {
+    fs.writeFileSync(this.statusFile, JSON.stringify({
+      installedAt: new Date().toISOString(),
+      modules: STARTUP_CHECK_MODULES
+    }));
+  }
+
   /**
    * Get path to bundled venv archive (pre-installed with all dependencies)
    * @returns {string|null}
@@ -163,15 +187,15 @@ class PythonManager {
     console.log('   Installing numpy...');
     await this.runCommand(venvPip, ['install', 'numpy']);
 
-    // Step 4: Install librosa (50%)
-    if (progressCallback) progressCallback(45, 'Installing librosa...');
-    console.log('   Installing librosa...');
-    await this.runCommand(venvPip, ['install', 'librosa']);
+    // Step 4: Install pydub (decoding fallback for formats libsndfile can't read)
+    if (progressCallback) progressCallback(45, 'Installing pydub...');
+    console.log('   Installing pydub...');
+    await this.runCommand(venvPip, ['install', 'pydub']);
 
-    // Step 5: Install soundfile (60%)
+    // Step 5: Install soundfile + soxr resampler (60%)
     if (progressCallback) progressCallback(60, 'Installing soundfile...');
     console.log('   Installing soundfile...');
-    await this.runCommand(venvPip, ['install', 'soundfile']);
+    await this.runCommand(venvPip, ['install', 'soundfile', 'soxr']);
 
     // Step 6: Install torch (80% - this is the biggest package)
     if (progressCallback) progressCallback(70, 'Installing torch (may take a few minutes)...');
@@ -188,13 +212,13 @@ class PythonManager {
     console.log('   Verifying installation...');
 
     try {
-      await this.runCommand(venvPython, ['-c', 'import librosa, numpy, sherpa_onnx, torch; print("OK")']);
+      await this.runCommand(venvPython, ['-c', 'import numpy, soundfile, soxr, sherpa_onnx, torch, torchaudio; print("OK")']);
     } catch (err) {
       throw new Error('Dependency verification failed');
     }
 
     // Mark as successfully installed
-    fs.writeFileSync(this.statusFile, new Date().toISOString());
+    this.writeStatusFile();
 
     if (progressCallback) progressCallback(100, 'Installation complete!');
     console.log('✅ Python dependencies installed successfully');
@@ -0,0 +1,289 @@
+const { spawn } = require('child_process');
+
+/**
+ * PythonWorker - Long-running Python process serving line-delimited requests
+ *
+ * Keeps a script (and its heavy imports / loaded models) alive across calls
+ * instead of paying interpreter startup on every transcription.
+ *
+ * Protocol:
+ * - Request: one JSON object per line on stdin
+ * - Response: one JSON header line on stdout, optionally followed by
+ *   `header.nbytes` bytes of raw binary payload
+ *
+ * The worker answers requests strictly in order, so callers are queued FIFO.
+ *
+ * With `waitForReady`, the script writes a `{"ready": true}` line once its
+ * models are loaded. Request timeouts only start counting after it, so slow
+ * startup (model load, warm-up) is bounded by `readyTimeoutMs` instead.
+ */
+class PythonWorker {
+  /**
+   * @param {string} name - Label used in logs
+   * @param {string} command - Executable to spawn
+   * @param {string[]} args - Arguments (script path and flags)
+   * @param {Object} options - Extra spawn options (cwd, env), plus
+   *   `waitForReady` and `readyTimeoutMs` (0 = no startup limit)
+   */
+  constructor(name, command, args, options = {}) {
+    const { waitForReady = false, readyTimeoutMs = 0, ...spawnOptions } = options;
+
+    this.name = name;
+    this.command = command;
+    this.args = args;
+    this.options = spawnOptions;
+    this.waitForReady = waitForReady;
+    this.readyTimeoutMs = readyTimeoutMs;
+
+    this.process = null;
+    this.pending = [];
+    this.buffer = Buffer.alloc(0);
+    this.currentHeader = null;
+    this.payload = null;
+    this.payloadOffset = 0;
+    this.stderr = '';
+    this.ready = false;
+    this.readyWaiters = [];
+    this.readyTimeoutId = null;
+  }
+
+  /**
+   * Spawn the worker process if it is not already running
+   */
+  start() {
+    if (this.process) {
+      return;
+    }
+
+    console.log(`Starting ${this.name} worker:`, this.command, this.args.join(' '));
+
+    const proc = spawn(this.command, this.args, {
+      ...this.options,
+      stdio: ['pipe', 'pipe', 'pipe']
+    });
+    this.process = proc;
+    this.ready = !this.waitForReady;
+
+    if (!this.ready && this.readyTimeoutMs > 0) {
+      this.readyTimeoutId = setTimeout(() => {
+        console.error(`⏱️  ${this.name} worker not ready after ${this.readyTimeoutMs}ms, killing process`);
+        this.stop(new Error(`${this.name} worker startup timeout (${this.readyTimeoutMs / 1000} seconds)`));
+      }, this.readyTimeoutMs);
+    }
+
+    proc.stdout.on('data', (chunk) => {
+      this.onData(chunk);
+    });
+
+    proc.stderr.on('data', (data) => {
+      const text = data.toString();
+      // Keep only the tail for error reporting
+      this.stderr = (this.stderr + text).slice(-8192);
+      console.log(`[${this.name}]`, text.trim());
+    });
+
+    // EPIPE when the child closed stdin or exited before 'close' fired:
+    // fail the pending requests instead of throwing in the main process
+    proc.stdin.on('error', (error) => {
+      this.onExit(proc, new Error(`${this.name} worker stdin closed (${error.message}): ${this.stderr.trim()}`));
+      proc.kill();
+    });
+
+    proc.on('error', (error) => {
+      const err = new Error(`Failed to start ${this.name} worker: ${error.message}`);
+      err.code = error.code;
+      this.onExit(proc, err);
+    });
+
+    proc.on('close', (code) => {
+      this.onExit(proc, new Error(`${this.name} worker exited (code ${code}): ${this.stderr.trim()}`));
+    });
+  }
+
+  /**
+   * @returns {boolean} Whether the worker process is alive
+   */
+  isRunning() {
+    return this.process !== null;
+  }
+
+  /**
+   * Send a request and wait for its response
+   * @param {Object} payload - JSON-serializable request
+   * @param {number} timeoutMs - Optional timeout; the worker is restarted on expiry
+   * @returns {Promise<{header: Object, payload: Buffer|null}>}
+   */
+  request(payload, timeoutMs = 0) {
+    this.start();
+
+    return new Promise((resolve, reject) => {
+      const entry = { resolve, reject, timeoutId: null };
+
+      const armTimeout = () => {
+        if (!this.pending.includes(entry)) {
+          return;
+        }
+        entry.timeoutId = setTimeout(() => {
+          console.error(`⏱️  ${this.name} worker timeout (${timeoutMs}ms), killing process`);
+          this.pending = this.pending.filter(e => e !== entry);
+          reject(new Error(`${this.name} request timeout (${timeoutMs / 1000} seconds)`));
+          // The response stream is out of sync once a request is abandoned
+          this.stop();
+        }, timeoutMs);
+      };
+
+      this.pending.push(entry);
+      this.write(JSON.stringify(payload) + '\n');
+
+      if (timeoutMs > 0) {
+        if (this.ready) {
+          armTimeout();
+        } else {
+          this.readyWaiters.push(armTimeout);
+        }
+      }
+    });
+  }
+
+  markReady() {
+    this.ready = true;
+    if (this.readyTimeoutId) {
+      clearTimeout(this.readyTimeoutId);
+      this.readyTimeoutId = null;
+    }
+
+    const waiters = this.readyWaiters;
+    this.readyWaiters = [];
+    for (const armTimeout of waiters) {
+      armTimeout();
+    }
+  }
+
+  /**
+   * Write one line to the worker's stdin
+   * Skipped once the process has exited: its pending requests are rejected
+   * when 'close' fires.
+   */
+  write(line) {
+    const proc = this.process;
+    if (!proc || proc.exitCode !== null || proc.signalCode !== null || !proc.stdin.writable) {
+      return;
+    }
+    proc.stdin.write(line);
+  }
+
+  onData(chunk) {
+    let data = chunk;
+
+    while (data.length > 0) {
+      // Binary payload: copy straight into the preallocated response buffer
+      if (this.payload) {
+        const n = Math.min(this.payload.length - this.payloadOffset, data.length);
+        data.copy(this.payload, this.payloadOffset, 0, n);
+        this.payloadOffset += n;
+        data = data.subarray(n);
+
+        if (this.payloadOffset === this.payload.length) {
+          this.finishResponse(this.payload);
+        }
+        continue;
+      }
+
+      const newline = data.indexOf(0x0a);
+      if (newline === -1) {
+        this.buffer = this.buffer.length > 0 ? Buffer.concat([this.buffer, data]) : data;
+        return;
+      }
+
+      const lineBuffer = this.buffer.length > 0
+        ? Buffer.concat([this.buffer, data.subarray(0, newline)])
+        : data.subarray(0, newline);
+      this.buffer = Buffer.alloc(0);
+      data = data.subarray(newline + 1);
+
+      const line = lineBuffer.toString('utf-8').trim();
+      if (!line) {
+        continue;
+      }
+
+      try {
+        this.currentHeader = JSON.parse(line);
+      } catch (e) {
+        // Stray prints from libraries are not part of the protocol
+        console.warn(`[${this.name}] Ignoring non-JSON output:`, line);
+        continue;
+      }
+
+      if (!this.ready && this.currentHeader.ready) {
+        this.currentHeader = null;
+        console.log(`✓ ${this.name} worker ready`);
+        this.markReady();
+        continue;
+      }
+
+      const nbytes = this.currentHeader.nbytes || 0;
+      if (nbytes > 0) {
+        // Unpooled allocation: starts at offset 0, so typed-array views are aligned
+        this.payload = Buffer.allocUnsafeSlow(nbytes);
+        this.payloadOffset = 0;
+      } else {
+        this.finishResponse(null);
+      }
+    }
+  }
+
+  finishResponse(payload) {
+    const header = this.currentHeader;
+    this.currentHeader = null;
+    this.payload = null;
+    this.payloadOffset = 0;
+
+    const entry = this.pending.shift();
+    if (entry) {
+      if (entry.timeoutId) clearTimeout(entry.timeoutId);
+      entry.resolve({ header, payload });
+    }
+  }
+
+  onExit(proc, error) {
+    if (this.process !== proc) {
+      return; // Already handled (error + close both fire)
+    }
+
+    this.process = null;
+    this.ready = false;
+    this.readyWaiters = [];
+    if (this.readyTimeoutId) {
+      clearTimeout(this.readyTimeoutId);
+      this.readyTimeoutId = null;
+    }
+    this.buffer = Buffer.alloc(0);
+    this.currentHeader = null;
+    this.payload = null;
+    this.payloadOffset = 0;
+
+    const pending = this.pending;
+    this.pending = [];
+    for (const entry of pending) {
+      if (entry.timeoutId) clearTimeout(entry.timeoutId);
+      entry.reject(error);
+    }
+  }
+
+  /**
+   * Terminate the worker process; pending requests are rejected
+   * @param {Error} error - Rejection reason for pending requests
+   */
+  stop(error = new Error(`${this.name} worker stopped`)) {
+    const proc = this.process;
+    if (!proc) {
+      return;
+    }
+
+    this.onExit(proc, error);
+    proc.stdin.end();
+    proc.kill();
+  }
+}
+
+module.exports = PythonWorker;